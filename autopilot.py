@@ -0,0 +1,313 @@
+import argparse
+from array import array
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+
+import snake_third
+from snake_third import APPLE, DOWN, LEFT, RIGHT, UP, Game
+
+# Порядок направлений в таблицах: индекс 0..3.
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+# Каталог кэша таблиц; переменная окружения SNAKE_CACHE_DIR его
+# переопределяет.
+CACHE_DIR = Path.home() / '.the_snake'
+
+# Формат файла таблиц: заголовок, затем массивы order, cycle,
+# neighbours и skips из беззнаковых 16-битных чисел (little-endian).
+TABLES_MAGIC = b'HAM1'
+TABLES_HEADER = struct.Struct('<4sHH')
+
+# Срезаем путь, только пока змейка занимает меньше этой доли поля:
+SHORTCUT_LIMIT = 0.5
+# Сколько свободных клеток оставляем между головой и хвостом при срезе:
+SAFETY_MARGIN = 3
+
+# Таблицы, уже загруженные в этом процессе, по размеру поля:
+_tables = {}
+
+
+class HamiltonTables:
+    """
+    Гамильтонов цикл по тору и таблицы срезов для поля.
+
+    Клетка (x, y) имеет номер x + y * width.
+
+    Атрибуты:
+        order (array): Номер клетки в цикле.
+        cycle (array): Клетка по номеру в цикле.
+        neighbours (array): Соседи клетки по DIRECTIONS, 4 на клетку.
+        skips (array): На сколько шагов цикла вперёд уводит ход
+            в соседа, 4 на клетку.
+    """
+
+    def __init__(self, width, height, order, cycle, neighbours, skips):
+        """Инициализация по готовым массивам."""
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.order = order
+        self.cycle = cycle
+        self.neighbours = neighbours
+        self.skips = skips
+
+
+def hamiltonian_cycle(width, height):
+    """
+    Строит гамильтонов цикл по тору width x height.
+
+    Змейкой обходим столбцы 1..width-1 строка за строкой, а по
+    столбцу 0 возвращаемся наверх. При нечётной высоте последняя
+    строка кончается у правого края и переходит в столбец 0 через
+    край поля, как и Snake.move.
+
+    :return: Список номеров клеток в порядке обхода.
+    """
+    if width < 2 or height < 2:
+        raise ValueError('Поле должно быть не меньше 2 x 2.')
+    cycle = []
+    for y in range(height):
+        columns = range(1, width)
+        if y % 2:
+            columns = reversed(columns)
+        cycle.extend(x + y * width for x in columns)
+    cycle.extend(y * width for y in reversed(range(height)))
+    return cycle
+
+
+def build_tables(width, height):
+    """Вычисляет цикл и таблицы срезов для поля width x height."""
+    size = width * height
+    cycle = array('H', hamiltonian_cycle(width, height))
+    order = array('H', bytes(2 * size))
+    for index, cell in enumerate(cycle):
+        order[cell] = index
+    neighbours = array('H')
+    skips = array('H')
+    for cell in range(size):
+        x, y = cell % width, cell // width
+        for dx, dy in DIRECTIONS:
+            neighbour = (x + dx) % width + (y + dy) % height * width
+            neighbours.append(neighbour)
+            skips.append((order[neighbour] - order[cell]) % size)
+    return HamiltonTables(width, height, order, cycle, neighbours, skips)
+
+
+def _little_endian(values):
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def save_tables(path, tables):
+    """
+    Сохраняет таблицы в компактном двоичном виде.
+
+    :param path: Путь к файлу.
+    :param tables: Экземпляр HamiltonTables.
+    """
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(TABLES_HEADER.pack(
+            TABLES_MAGIC, tables.width, tables.height
+        ))
+        for values in (tables.order, tables.cycle, tables.neighbours,
+                       tables.skips):
+            file.write(_little_endian(values).tobytes())
+    os.replace(tmp_path, path)
+
+
+def load_tables(path):
+    """
+    Загружает таблицы из файла.
+
+    :param path: Путь к файлу.
+    :return: Экземпляр HamiltonTables.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    magic, width, height = TABLES_HEADER.unpack_from(data)
+    size = width * height
+    if (magic != TABLES_MAGIC
+            or len(data) != TABLES_HEADER.size + 2 * 10 * size):
+        raise ValueError(f'Файл {path} не является таблицами автопилота.')
+    parts = []
+    offset = TABLES_HEADER.size
+    for count in (size, size, 4 * size, 4 * size):
+        values = array('H')
+        values.frombytes(data[offset:offset + 2 * count])
+        parts.append(_little_endian(values))
+        offset += 2 * count
+    return HamiltonTables(width, height, *parts)
+
+
+def tables_for(width, height, cache_dir=None):
+    """
+    Возвращает таблицы для поля, вычисляя их не больше одного раза.
+
+    Сначала ищет их в памяти процесса, затем в файле кэша и только
+    потом строит заново и сохраняет.
+
+    :param width: Ширина поля в клетках.
+    :param height: Высота поля в клетках.
+    :param cache_dir: Каталог кэша; по умолчанию CACHE_DIR.
+    """
+    key = (width, height)
+    if key in _tables:
+        return _tables[key]
+    if cache_dir is None:
+        cache_dir = os.environ.get('SNAKE_CACHE_DIR', CACHE_DIR)
+    path = Path(cache_dir) / f'hamilton-{width}x{height}.bin'
+    try:
+        tables = load_tables(path)
+    except (OSError, ValueError, struct.error):
+        tables = build_tables(width, height)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        save_tables(path, tables)
+    _tables[key] = tables
+    return tables
+
+
+class Autopilot:
+    """
+    Бот, который идёт по гамильтонову циклу и срезает путь к яблоку.
+
+    Тело змейки всегда лежит на отрезке цикла от хвоста до головы,
+    поэтому срез безопасен, если он не перепрыгивает хвост с запасом
+    на рост. Выбор хода - четыре чтения из таблиц, O(1) на тик.
+    """
+
+    def __init__(self, tables, grid_size):
+        """
+        Инициализация автопилота.
+
+        :param tables: Экземпляр HamiltonTables для поля.
+        :param grid_size: Размер клетки в пикселях.
+        """
+        self.tables = tables
+        self.grid_size = grid_size
+
+    def cell_of(self, position):
+        """Возвращает номер клетки по позиции в пикселях."""
+        return (position[0] // self.grid_size
+                + position[1] // self.grid_size * self.tables.width)
+
+    def choose(self, snake, target=None, hazards=()):
+        """
+        Выбирает направление следующего хода.
+
+        :param snake: Змейка с positions, length и direction.
+        :param target: Клетка яблока или None.
+        :param hazards: Клетки, которых нужно избегать.
+        :return: Направление из DIRECTIONS.
+        """
+        tables = self.tables
+        size = tables.size
+        order = tables.order
+        head = self.cell_of(snake.positions[0])
+        if len(snake.positions) > 1:
+            tail = self.cell_of(snake.positions[-1])
+            free = (order[tail] - order[head]) % size
+        else:
+            free = size
+        free -= snake.length - len(snake.positions) + SAFETY_MARGIN
+        if target is None or snake.length >= size * SHORTCUT_LIMIT:
+            goal = 1
+        else:
+            goal = (order[target] - order[head]) % size
+        backwards = (-snake.direction[0], -snake.direction[1])
+        best = follow = None
+        best_skip = 0
+        base = head * 4
+        for index in range(4):
+            skip = tables.skips[base + index]
+            if skip == 1:
+                follow = index
+            if DIRECTIONS[index] == backwards:
+                continue
+            if tables.neighbours[base + index] in hazards:
+                continue
+            if skip != 1 and (skip >= free or skip > goal):
+                continue
+            if skip > best_skip:
+                best, best_skip = index, skip
+        return DIRECTIONS[follow if best is None else best]
+
+    def steer(self, game):
+        """Задаёт змейке партии Game направление следующего хода."""
+        target = None
+        hazards = set()
+        for obj in game.game_objects:
+            cell = self.cell_of(obj.position)
+            if obj.kind == APPLE:
+                target = cell
+            else:
+                hazards.add(cell)
+        game.snake.next_direction = self.choose(game.snake, target, hazards)
+
+
+class AttractGame(Game):
+    """Демонстрационная партия, в которой змейкой управляет автопилот."""
+
+    def __init__(self, snake, game_objects, autopilot, hud=None):
+        """
+        Инициализация демонстрационной партии.
+
+        :param autopilot: Экземпляр Autopilot для поля партии.
+        """
+        super().__init__(snake, game_objects, hud=hud)
+        self.autopilot = autopilot
+
+    def update(self):
+        """Выбирает ход автопилотом и выполняет тик."""
+        self.autopilot.steer(self)
+        super().update()
+
+
+def for_current_board(cache_dir=None):
+    """Создаёт автопилот для текущего размера поля snake_third."""
+    tables = tables_for(snake_third.GRID_WIDTH, snake_third.GRID_HEIGHT,
+                        cache_dir)
+    return Autopilot(tables, snake_third.GRID_SIZE)
+
+
+def main():
+    """Запуск демонстрации или замер загрузки таблиц."""
+    parser = argparse.ArgumentParser(description='Автопилот змейки.')
+    parser.add_argument('--bench', action='store_true',
+                        help='замерить построение и загрузку таблиц')
+    args = parser.parse_args()
+    width, height = snake_third.GRID_WIDTH, snake_third.GRID_HEIGHT
+    if args.bench:
+        started = time.perf_counter()
+        tables = build_tables(width, height)
+        built = time.perf_counter() - started
+        path = Path(os.environ.get('SNAKE_CACHE_DIR', CACHE_DIR)) / \
+            f'hamilton-{width}x{height}.bin'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        save_tables(path, tables)
+        started = time.perf_counter()
+        load_tables(path)
+        loaded = time.perf_counter() - started
+        print(f'поле {width}x{height}: построение {built * 1e3:.2f} мс, '
+              f'загрузка {loaded * 1e3:.2f} мс, '
+              f'файл {path.stat().st_size} байт')
+        return
+    from hud import Hud
+
+    entities = snake_third.new_entity_store()
+    game = AttractGame(
+        snake_third.Snake(),
+        [snake_third.Apple(entities=entities)],
+        for_current_board(),
+        Hud(),
+    )
+    game.run()
+
+
+if __name__ == "__main__":
+    main()
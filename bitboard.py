@@ -0,0 +1,263 @@
+import random
+import time
+from collections import deque
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def popcount(bits):
+        """Возвращает число единичных битов."""
+        return bin(bits).count('1')
+
+
+class Bitboard:
+    """
+    Битовые доски поля-тора width x height на целых Python.
+
+    Клетка (x, y) - бит номер x + y * width. Соседи всех клеток доски
+    находятся четырьмя сдвигами с переносом через край, как в
+    Snake.move, поэтому заливка стоит O(диаметр) операций над целыми,
+    а не O(клеток) шагов Python.
+
+    Атрибуты:
+        full (int): Доска со всеми клетками.
+    """
+
+    def __init__(self, width, height):
+        """
+        Инициализация масок для поля.
+
+        :param width: Ширина поля в клетках.
+        :param height: Высота поля в клетках.
+        """
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.full = (1 << self.size) - 1
+        first_column = 0
+        for y in range(height):
+            first_column |= 1 << (y * width)
+        self.first_column = first_column
+        self.last_column = first_column << (width - 1)
+        self.first_row = (1 << width) - 1
+        self.last_row = self.first_row << (self.size - width)
+
+    def bit(self, x, y):
+        """Возвращает доску с одной клеткой (x, y)."""
+        return 1 << (x % self.width + y % self.height * self.width)
+
+    def from_cells(self, cells):
+        """Возвращает доску из координат клеток (x, y)."""
+        bits = 0
+        width = self.width
+        for x, y in cells:
+            bits |= 1 << (x + y * width)
+        return bits
+
+    def from_positions(self, positions, grid_size):
+        """Возвращает доску из позиций в пикселях."""
+        bits = 0
+        width = self.width
+        for x, y in positions:
+            bits |= 1 << (x // grid_size + y // grid_size * width)
+        return bits
+
+    def cells(self, bits):
+        """Перечисляет координаты (x, y) клеток доски."""
+        while bits:
+            low = bits & -bits
+            index = low.bit_length() - 1
+            yield index % self.width, index // self.width
+            bits ^= low
+
+    def east(self, bits):
+        """Сдвигает доску на клетку вправо с переносом."""
+        return (((bits & ~self.last_column) << 1)
+                | ((bits & self.last_column) >> (self.width - 1)))
+
+    def west(self, bits):
+        """Сдвигает доску на клетку влево с переносом."""
+        return (((bits & ~self.first_column) >> 1)
+                | ((bits & self.first_column) << (self.width - 1)))
+
+    def south(self, bits):
+        """Сдвигает доску на клетку вниз с переносом."""
+        return (((bits & ~self.last_row) << self.width)
+                | ((bits & self.last_row) >> (self.size - self.width)))
+
+    def north(self, bits):
+        """Сдвигает доску на клетку вверх с переносом."""
+        return ((bits >> self.width)
+                | ((bits & self.first_row) << (self.size - self.width)))
+
+    def expand(self, bits):
+        """Возвращает клетки доски вместе со всеми их соседями."""
+        return (bits | self.east(bits) | self.west(bits)
+                | self.south(bits) | self.north(bits))
+
+    def flood(self, seeds, free):
+        """
+        Заливка: клетки free, достижимые из seeds по соседям.
+
+        :param seeds: Доска начальных клеток (сами они могут быть
+            вне free).
+        :param free: Доска проходимых клеток.
+        """
+        reached = seeds
+        frontier = seeds
+        while frontier:
+            grown = self.expand(frontier) & free & ~reached
+            reached |= grown
+            frontier = grown
+        return reached & free
+
+    def regions(self, free):
+        """Возвращает список связных областей доски free."""
+        found = []
+        while free:
+            region = self.flood(free & -free, free)
+            found.append(region)
+            free &= ~region
+        return found
+
+    def reachable(self, head, body, growth=0, blocked=0, limit=None):
+        """
+        Клетки, куда голова может дойти с учётом уходящего хвоста.
+
+        Сегмент body[k] (k от головы) освобождается через
+        len(body) - k + growth + 1 ходов: Snake.move проверяет
+        столкновение до того, как убрать хвост. Клетка тела достижима,
+        если голова приходит в неё не раньше.
+
+        :param head: Координаты головы (x, y).
+        :param body: Координаты сегментов от головы к хвосту.
+        :param growth: Сколько ходов хвост ещё будет стоять на месте.
+        :param blocked: Доска постоянно непроходимых клеток.
+        :param limit: Наибольшее число ходов или None.
+        :return: Доска достижимых клеток.
+        """
+        # occupied - тело на текущем ходу; голова уже не препятствие.
+        width = self.width
+        segments = [1 << (x + y * width) for x, y in body]
+        occupied = 0
+        for segment in segments[1:]:
+            occupied |= segment
+        free = self.full & ~blocked
+        reached = frontier = self.bit(*head)
+        step = 0
+        tail = len(segments)
+        while frontier and (limit is None or step < limit):
+            step += 1
+            # Хвост уходит на клетку за ход, если змейка не растёт;
+            # на первом ходу он ещё на месте.
+            if step > growth + 1 and tail > 1:
+                tail -= 1
+                occupied &= ~segments[tail]
+            grown = self.expand(frontier) & free & ~occupied & ~reached
+            reached |= grown
+            frontier = grown
+        return reached & ~self.bit(*head)
+
+    def snake_cells(self, snake, grid_size):
+        """
+        Возвращает тело змейки в клетках и число ходов до сдвига хвоста.
+
+        :param snake: Змейка с positions и length.
+        :param grid_size: Размер клетки в пикселях.
+        :return: Пара (координаты сегментов от головы, growth).
+        """
+        body = [(x // grid_size, y // grid_size) for x, y in snake.positions]
+        return body, max(snake.length - len(body), 0)
+
+    def is_trap(self, head, direction, body, growth=0, blocked=0):
+        """
+        Проверяет, запирает ли ход голову в слишком тесной области.
+
+        :param direction: Смещение (dx, dy) хода.
+        :return: True, если после хода достижимых клеток меньше длины
+            змейки.
+        """
+        target = ((head[0] + direction[0]) % self.width,
+                  (head[1] + direction[1]) % self.height)
+        if target in body[1:] or blocked & self.bit(*target):
+            return True
+        moved = [target] + list(body[:-1] if not growth else body)
+        room = self.reachable(target, moved, max(growth - 1, 0), blocked)
+        return popcount(room) < len(moved)
+
+
+def bfs_reachable(width, height, head, body, growth=0, blocked=()):
+    """
+    Та же достижимость с учётом хвоста простым обходом в ширину.
+
+    Эталон для проверки и замеров Bitboard.reachable.
+
+    :return: Множество координат достижимых клеток.
+    """
+    release = {cell: len(body) - index + growth + 1
+               for index, cell in enumerate(body) if index}
+    blocked = set(blocked)
+    seen = {head}
+    queue = deque([(head, 0)])
+    reached = set()
+    while queue:
+        (x, y), step = queue.popleft()
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            cell = ((x + dx) % width, (y + dy) % height)
+            if cell in seen or cell in blocked:
+                continue
+            if release.get(cell, 0) > step + 1:
+                continue
+            seen.add(cell)
+            reached.add(cell)
+            queue.append((cell, step + 1))
+    return reached
+
+
+def random_body(width, height, length, rng):
+    """Возвращает тело змейки случайного блуждания без самопересечений."""
+    body = [(rng.randrange(width), rng.randrange(height))]
+    taken = set(body)
+    while len(body) < length:
+        x, y = body[-1]
+        options = [((x + dx) % width, (y + dy) % height)
+                   for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))]
+        options = [cell for cell in options if cell not in taken]
+        if not options:
+            break
+        cell = rng.choice(options)
+        body.append(cell)
+        taken.add(cell)
+    return body
+
+
+def benchmark(width=54, height=32, length=400, queries=200, report=print):
+    """
+    Сравнивает Bitboard.reachable с обходом в ширину.
+
+    :param width: Ширина поля.
+    :param height: Высота поля.
+    :param length: Длина змейки.
+    :param queries: Число запросов на замер.
+    :param report: Функция вывода строки результата.
+    """
+    rng = random.Random(0)
+    board = Bitboard(width, height)
+    bodies = [random_body(width, height, length, rng) for _ in range(20)]
+    results = {}
+    for label, query in (
+        ('битборд', lambda body: board.reachable(body[0], body)),
+        ('BFS', lambda body: bfs_reachable(width, height, body[0], body)),
+    ):
+        started = time.perf_counter()
+        for index in range(queries):
+            query(bodies[index % len(bodies)])
+        results[label] = (time.perf_counter() - started) / queries
+        report(f'{label:>8}: {results[label] * 1e6:9.1f} мкс на запрос, '
+               f'{1 / results[label]:8.0f} запросов/с '
+               f'(поле {width}x{height}, длина {length})')
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
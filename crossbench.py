@@ -0,0 +1,277 @@
+import argparse
+import importlib
+import os
+import random
+import time
+
+# Окно не нужно: замеряем логику и отрисовку в памяти.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SNAKE_STATS_DB', ':memory:')
+
+import pygame  # noqa: E402
+
+from pacing import SLEEP  # noqa: E402
+
+MODULES = ('the_snake', 'the_snake_second', 'snake_third')
+TRACKED_CLASSES = ('Snake', 'Apple', 'Poison', 'Stone')
+BOARD_CONSTANTS = (
+    'SCREEN_WIDTH', 'SCREEN_HEIGHT', 'GRID_WIDTH', 'GRID_HEIGHT',
+)
+REFERENCE_MODULE = 'snake_third'
+
+STATE_FIELDS = ('сегменты', 'длина', 'направление', 'предметы')
+KEYS = (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT)
+KEY_PRESS_CHANCE = 0.3
+
+
+class StopRun(Exception):
+    """Прерывает бесконечный игровой цикл после нужного числа тиков."""
+
+
+def make_inputs(seed, ticks):
+    """
+    Генерирует воспроизводимую последовательность нажатий.
+
+    :param seed: Зерно генератора.
+    :param ticks: Число тиков.
+    :return: Список кодов клавиш или None для каждого тика.
+    """
+    rng = random.Random(seed)
+    return [
+        rng.choice(KEYS) if rng.random() < KEY_PRESS_CHANCE else None
+        for _ in range(ticks)
+    ]
+
+
+class HeadlessClock:
+    """
+    Заглушка pygame.time.Clock, которая не спит, а ведёт прогон.
+
+    Каждый вызов tick отмечает конец предыдущего кадра.
+    """
+
+    def __init__(self, run):
+        """Инициализация часов для прогона Run."""
+        self.run = run
+
+    def tick(self, *args, **kwargs):
+        """Отмечает начало кадра без ожидания."""
+        return self.run.on_tick()
+
+    tick_busy_loop = tick
+
+    def get_fps(self):
+        """Возвращает условную частоту кадров."""
+        return 0.0
+
+    def get_time(self):
+        """Возвращает условную длительность кадра."""
+        return 0
+
+    get_rawtime = get_time
+
+
+def _recording_class(cls, registry):
+    class Recorded(cls):
+        def __init__(self, *args, **kwargs):
+            registry[cls.__name__] = self
+            super().__init__(*args, **kwargs)
+
+    Recorded.__name__ = Recorded.__qualname__ = cls.__name__
+    return Recorded
+
+
+class Run:
+    """
+    Прогон одной реализации игры на заданных нажатиях.
+
+    Атрибуты:
+        states (list): Состояние игры после каждого тика.
+        frame_times (list): Длительность каждого кадра в секундах.
+    """
+
+    def __init__(self, module_name, inputs, seed, board=None):
+        """
+        Инициализация прогона.
+
+        :param module_name: Имя модуля с функцией main.
+        :param inputs: Нажатия по тикам (см. make_inputs).
+        :param seed: Зерно расстановки предметов.
+        :param board: Словарь констант размера поля для подмены.
+        """
+        self.module = importlib.import_module(module_name)
+        self.inputs = inputs
+        self.seed = seed
+        self.board = board or {}
+        self.objects = {}
+        self.states = []
+        self.frame_times = []
+        self._tick = 0
+        self._pending = []
+        self._started = None
+
+    def snapshot(self):
+        """Возвращает сравнимое состояние игры."""
+        snake = self.objects['Snake']
+        items = tuple(
+            self.objects[name].position for name in TRACKED_CLASSES[1:]
+        )
+        return (tuple(snake.positions), snake.length, snake.direction, items)
+
+    def on_tick(self):
+        """Вызывается заглушкой часов в начале каждого кадра."""
+        now = time.perf_counter()
+        if self._tick:
+            self.frame_times.append(now - self._started)
+            self.states.append(self.snapshot())
+        if self._tick == len(self.inputs):
+            raise StopRun
+        key = self.inputs[self._tick]
+        if key is not None:
+            self._pending.append(
+                pygame.event.Event(pygame.KEYDOWN, key=key)
+            )
+        self._tick += 1
+        self._started = time.perf_counter()
+        return 0
+
+    def _get_events(self, *args, **kwargs):
+        events, self._pending = self._pending, []
+        return events
+
+    def execute(self):
+        """Запускает main модуля с подменёнными часами, событиями и RNG."""
+        module = self.module
+        replaced = {
+            'clock': HeadlessClock(self),
+            'randint': random.Random(self.seed).randint,
+        }
+        replaced.update(self.board)
+        if hasattr(module, 'FRAME_PACING'):
+            # Ждать должны только часы-заглушка, а не настоящий сон.
+            replaced['FRAME_PACING'] = SLEEP
+        for name in TRACKED_CLASSES:
+            replaced[name] = _recording_class(
+                getattr(module, name), self.objects
+            )
+        originals = {name: getattr(module, name) for name in replaced}
+        original_get = pygame.event.get
+        for name, value in replaced.items():
+            setattr(module, name, value)
+        pygame.event.get = self._get_events
+        try:
+            module.main()
+        except StopRun:
+            pass
+        finally:
+            pygame.event.get = original_get
+            for name, value in originals.items():
+                setattr(module, name, value)
+        return self
+
+
+def percentile(values, fraction):
+    """Возвращает перцентиль отсортированного списка."""
+    index = min(len(values) - 1, int(fraction * len(values)))
+    return values[index]
+
+
+def summarize(run):
+    """
+    Считает пропускную способность и распределение длительности кадров.
+
+    :param run: Выполненный экземпляр Run.
+    :return: Словарь со статистикой (времена в микросекундах).
+    """
+    times = sorted(run.frame_times)
+    total = sum(times)
+    return {
+        'ticks_per_sec': len(times) / total if total else float('inf'),
+        'p50': percentile(times, 0.50) * 1e6,
+        'p95': percentile(times, 0.95) * 1e6,
+        'p99': percentile(times, 0.99) * 1e6,
+        'max': times[-1] * 1e6,
+    }
+
+
+def first_divergence(reference, other):
+    """
+    Ищет первый тик, на котором состояния прогонов различаются.
+
+    :return: Номер тика (с единицы) или None, если прогоны совпали.
+    """
+    for tick, (expected, actual) in enumerate(zip(reference, other), 1):
+        if expected != actual:
+            return tick
+    if len(reference) != len(other):
+        return min(len(reference), len(other)) + 1
+    return None
+
+
+def differing_fields(expected, actual):
+    """Возвращает названия различающихся частей двух состояний."""
+    return [
+        field for field, left, right in zip(STATE_FIELDS, expected, actual)
+        if left != right
+    ]
+
+
+def compare(ticks=1000, seed=0, modules=MODULES):
+    """
+    Прогоняет реализации на одинаковых входах.
+
+    :param ticks: Число тиков.
+    :param seed: Зерно нажатий и расстановки предметов.
+    :param modules: Имена модулей для сравнения.
+    :return: Словарь {имя модуля: выполненный Run}.
+    """
+    if ticks < 1:
+        raise ValueError('Число тиков должно быть положительным.')
+    reference = importlib.import_module(REFERENCE_MODULE)
+    board = {name: getattr(reference, name) for name in BOARD_CONSTANTS}
+    inputs = make_inputs(seed, ticks)
+    return {
+        name: Run(name, inputs, seed, board).execute() for name in modules
+    }
+
+
+def report(runs, reference=REFERENCE_MODULE):
+    """
+    Печатает сравнительную таблицу прогонов.
+
+    :param runs: Результат compare.
+    :param reference: Модуль, с которым сравниваются состояния.
+    """
+    print(f'{"модуль":<18}{"тик/с":>10}{"p50":>9}{"p95":>9}'
+          f'{"p99":>9}{"max":>9}  совпадение с {reference}')
+    expected = runs[reference].states
+    for name, run in runs.items():
+        stats = summarize(run)
+        tick = first_divergence(expected, run.states)
+        if tick is None:
+            verdict = 'да'
+        else:
+            fields = differing_fields(
+                expected[tick - 1], run.states[tick - 1]
+            )
+            verdict = f'расхождение на тике {tick}: {", ".join(fields)}'
+        print(f'{name:<18}{stats["ticks_per_sec"]:>10.0f}'
+              f'{stats["p50"]:>9.1f}{stats["p95"]:>9.1f}'
+              f'{stats["p99"]:>9.1f}{stats["max"]:>9.1f}  {verdict}')
+
+
+def main():
+    """Запуск сравнения из командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Сравнение трёх реализаций змейки.'
+    )
+    parser.add_argument('--ticks', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    if args.ticks < 1:
+        parser.error('--ticks должно быть положительным')
+    report(compare(args.ticks, args.seed))
+
+
+if __name__ == "__main__":
+    main()
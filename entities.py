@@ -0,0 +1,284 @@
+import time
+from array import array
+
+import pygame
+
+# Нет сущности или клетки:
+NO_ENTITY = -1
+NO_CELL = -1
+
+# Общие таблицы кортежей позиций в пикселях по размеру поля:
+_pixel_tables = {}
+
+
+def pixel_table(width, height, cell_size):
+    """
+    Возвращает позиции в пикселях для всех клеток поля.
+
+    Клетка с координатами (x, y) имеет номер x + y * width.
+    """
+    key = (width, height, cell_size)
+    if key not in _pixel_tables:
+        _pixel_tables[key] = [
+            (x * cell_size, y * cell_size)
+            for y in range(height) for x in range(width)
+        ]
+    return _pixel_tables[key]
+
+
+def pack_color(color):
+    """Упаковывает цвет (r, g, b) в одно целое."""
+    return (color[0] << 16) | (color[1] << 8) | color[2]
+
+
+def unpack_color(value):
+    """Распаковывает цвет из целого в кортеж (r, g, b)."""
+    return (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF
+
+
+class EntityStore:
+    """
+    Хранилище игровых предметов в параллельных массивах.
+
+    Тип, клетка и цвет каждой сущности лежат в отдельных массивах,
+    клетки поля указывают на первую сущность в них (цепочка через
+    next_in_cell). Взаимодействие выбирается по типу из таблицы
+    interactions, а отрисовка делается одним blits на тип.
+
+    Атрибуты:
+        kinds (array): Тип каждой сущности.
+        cells (array): Номер клетки каждой сущности или NO_CELL.
+        colors (array): Упакованный цвет каждой сущности.
+    """
+
+    def __init__(self, width, height, cell_size, interactions=None,
+                 border_color=None, rng=None):
+        """
+        Инициализация пустого хранилища.
+
+        :param width: Ширина поля в клетках.
+        :param height: Высота поля в клетках.
+        :param cell_size: Размер клетки в пикселях.
+        :param interactions: Словарь {тип: функция(store, index, snake)}.
+        :param border_color: Цвет рамки клетки или None.
+        :param rng: Свой random.Random для перестановки сущностей или
+            None для общего генератора.
+        """
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.interactions = dict(interactions or {})
+        self.border_color = border_color
+        self.rng = rng
+        self.pixels = pixel_table(width, height, cell_size)
+        self.kinds = array('B')
+        self.cells = array('l')
+        self.colors = array('L')
+        self.next_in_cell = array('l')
+        self.first_in_cell = array('l', [NO_ENTITY]) * (width * height)
+        self._tiles = {}
+        self._batches = None
+
+    def __len__(self):
+        """Возвращает число сущностей."""
+        return len(self.kinds)
+
+    def add(self, kind, color, position=None):
+        """
+        Добавляет сущность.
+
+        :param kind: Тип сущности (ключ таблицы interactions).
+        :param color: Цвет (r, g, b).
+        :param position: Позиция в пикселях или None.
+        :return: Индекс новой сущности.
+        """
+        index = len(self.kinds)
+        self.kinds.append(kind)
+        self.cells.append(NO_CELL)
+        self.colors.append(pack_color(color))
+        self.next_in_cell.append(NO_ENTITY)
+        if position is not None:
+            self.place(index, position)
+        self._batches = None
+        return index
+
+    def cell_of(self, position):
+        """Возвращает номер клетки по позиции в пикселях."""
+        return (position[0] // self.cell_size
+                + position[1] // self.cell_size * self.width)
+
+    def position(self, index):
+        """Возвращает позицию сущности в пикселях или None."""
+        cell = self.cells[index]
+        return None if cell == NO_CELL else self.pixels[cell]
+
+    def color(self, index):
+        """Возвращает цвет сущности."""
+        return unpack_color(self.colors[index])
+
+    def set_color(self, index, color):
+        """Меняет цвет сущности."""
+        self.colors[index] = pack_color(color)
+        self._batches = None
+
+    def place(self, index, position):
+        """
+        Переставляет сущность в клетку с данной позицией.
+
+        :param index: Индекс сущности.
+        :param position: Позиция в пикселях или None, чтобы убрать с поля.
+        """
+        old_cell = self.cells[index]
+        if old_cell != NO_CELL:
+            self._unlink(index, old_cell)
+        if position is None:
+            self.cells[index] = NO_CELL
+        else:
+            cell = self.cell_of(position)
+            self.next_in_cell[index] = self.first_in_cell[cell]
+            self.first_in_cell[cell] = index
+            self.cells[index] = cell
+        self._batches = None
+
+    def snapshot(self):
+        """Возвращает копию клеток всех сущностей."""
+        return self.cells[:]
+
+    def restore(self, cells):
+        """
+        Возвращает сущности в клетки из snapshot.
+
+        :param cells: Результат snapshot того же хранилища.
+        """
+        first_in_cell = self.first_in_cell
+        for cell in self.cells:
+            if cell != NO_CELL:
+                first_in_cell[cell] = NO_ENTITY
+        self.cells[:] = cells
+        for index, cell in enumerate(cells):
+            if cell != NO_CELL:
+                self.next_in_cell[index] = first_in_cell[cell]
+                first_in_cell[cell] = index
+        self._batches = None
+
+    def _unlink(self, index, cell):
+        current = self.first_in_cell[cell]
+        if current == index:
+            self.first_in_cell[cell] = self.next_in_cell[index]
+            return
+        while current != NO_ENTITY:
+            following = self.next_in_cell[current]
+            if following == index:
+                self.next_in_cell[current] = self.next_in_cell[index]
+                return
+            current = following
+
+    def at(self, position):
+        """Возвращает индексы сущностей в клетке по порядку добавления."""
+        found = []
+        current = self.first_in_cell[self.cell_of(position)]
+        while current != NO_ENTITY:
+            found.append(current)
+            current = self.next_in_cell[current]
+        found.sort()
+        return found
+
+    def dispatch(self, index, snake):
+        """Применяет к змейке взаимодействие сущности по её типу."""
+        handler = self.interactions.get(self.kinds[index])
+        if handler is not None:
+            handler(self, index, snake)
+
+    def interact(self, position, snake):
+        """
+        Применяет взаимодействия всех сущностей в клетке головы.
+
+        В пустой клетке это одна проверка массива.
+        """
+        if self.first_in_cell[self.cell_of(position)] == NO_ENTITY:
+            return
+        for index in self.at(position):
+            self.dispatch(index, snake)
+
+    def _tile(self, color, surface):
+        tile = self._tiles.get(color)
+        if tile is None:
+            # Формат плитки совпадает с экраном: blits копирует без
+            # преобразования пикселей.
+            tile = pygame.Surface((self.cell_size, self.cell_size), 0,
+                                  surface)
+            tile.fill(unpack_color(color))
+            if self.border_color is not None:
+                pygame.draw.rect(tile, self.border_color, tile.get_rect(), 1)
+            self._tiles[color] = tile
+        return tile
+
+    def _build_batches(self, surface):
+        # В каждой клетке видна только последняя добавленная сущность
+        # (её объект рисовался бы поверх), остальные не рисуем вовсе.
+        batches = {}
+        for cell, current in enumerate(self.first_in_cell):
+            if current == NO_ENTITY:
+                continue
+            visible = current
+            while current != NO_ENTITY:
+                if current > visible:
+                    visible = current
+                current = self.next_in_cell[current]
+            batches.setdefault(self.kinds[visible], []).append(
+                (self._tile(self.colors[visible], surface), self.pixels[cell])
+            )
+        return list(batches.values())
+
+    def draw(self, surface):
+        """
+        Рисует все сущности: по одному вызову blits на тип.
+
+        Списки для blits пересобираются, только если сущности двигались
+        или меняли цвет.
+        """
+        if self._batches is None:
+            self._batches = self._build_batches(surface)
+        for batch in self._batches:
+            surface.blits(batch, False)
+
+
+def benchmark(items=10000, ticks=100, report=print):
+    """
+    Сравнивает тик с хранилищем и с циклом по отдельным объектам.
+
+    Обновление и отрисовка замеряются отдельно: отрисовка упирается
+    в копирование пикселей, обновление — в накладные расходы Python.
+
+    :param items: Число предметов на поле.
+    :param ticks: Число тиков на замер.
+    :param report: Функция вывода строки результата.
+    """
+    import snake_third
+
+    shared = snake_third.new_entity_store()
+    results = {}
+    for label, game_objects in (
+        ('хранилище',
+         [snake_third.Stone(entities=shared) for _ in range(items)]),
+        # У каждого объекта своё хранилище: Game обходит их по одному.
+        ('по объектам', [snake_third.Stone() for _ in range(items)]),
+    ):
+        game = snake_third.Game(snake_third.Snake(), game_objects)
+        update = draw = 0.0
+        for _ in range(ticks):
+            started = time.perf_counter()
+            game.update()
+            drawn = time.perf_counter()
+            game.draw_objects()
+            update += drawn - started
+            draw += time.perf_counter() - drawn
+        results[label] = (update / ticks, draw / ticks)
+        report(f'{label:>12}: обновление {update / ticks * 1e6:9.1f} мкс, '
+               f'отрисовка {draw / ticks * 1e3:7.2f} мс '
+               f'на {items} предметов')
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
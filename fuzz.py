@@ -0,0 +1,312 @@
+import argparse
+import json
+import os
+import random
+import time
+from collections import namedtuple
+from multiprocessing import Pool
+
+from headless import new_game
+from snake_third import (
+    DOWN, GRID_SIZE, LEFT, RIGHT, SCREEN_HEIGHT, SCREEN_WIDTH, UP,
+)
+
+# Коды ввода: индекс в этом кортеже (0 - нет нажатия).
+INPUTS = (None, UP, DOWN, LEFT, RIGHT)
+# Вероятность нажатия на тике в случайном вводе:
+KEY_PRESS_CHANCE = 0.2
+
+# Длина случайного случая в тиках:
+CASE_TICKS = 500
+# Доля случаев, полученных мутацией корпуса, а не с нуля:
+MUTATION_SHARE = 0.5
+# Сколько упавших случаев воркер возвращает на уменьшение:
+MAX_FAILURES = 8
+
+# Упавший случай: нарушенный инвариант, зерно партии, коды ввода и тик.
+Failure = namedtuple('Failure', ('invariant', 'seed', 'inputs', 'tick'))
+
+
+def _body_is_unique(game):
+    positions = game.snake.positions
+    return len(set(positions)) == len(positions)
+
+
+def _body_fits_length(game):
+    return 0 < len(game.snake.positions) <= game.snake.length
+
+
+def _items_on_board(game):
+    for obj in game.game_objects:
+        x, y = obj.position
+        if (not 0 <= x < SCREEN_WIDTH or not 0 <= y < SCREEN_HEIGHT
+                or x % GRID_SIZE or y % GRID_SIZE):
+            return False
+    return True
+
+
+def _items_on_free_cells(game):
+    positions = game.snake.positions
+    return all(obj.position not in positions for obj in game.game_objects)
+
+
+# Инварианты, которые проверяются после каждого тика:
+INVARIANTS = {
+    'body_is_unique': _body_is_unique,
+    'body_fits_length': _body_fits_length,
+    'items_on_board': _items_on_board,
+    'items_on_free_cells': _items_on_free_cells,
+}
+
+
+def random_inputs(rng, ticks):
+    """Возвращает случайные коды ввода на ticks тиков."""
+    return bytes(
+        rng.randrange(1, len(INPUTS)) if rng.random() < KEY_PRESS_CHANCE
+        else 0
+        for _ in range(ticks)
+    )
+
+
+def run_case(seed, inputs, invariants=INVARIANTS, coverage=None):
+    """
+    Проигрывает случай и проверяет инварианты после каждого тика.
+
+    Исключение в игре тоже считается нарушением.
+
+    :param seed: Зерно расстановки предметов.
+    :param inputs: Коды ввода по тикам (bytes).
+    :param invariants: Словарь {имя: проверка(game)}.
+    :param coverage: Множество, куда добавляются признаки покрытия.
+    :return: Failure или None.
+    """
+    game = new_game(seed, isolated=True)
+    snake = game.snake
+    deaths = []
+    snake.on_death = deaths.append
+    checks = tuple(invariants.items())
+    for tick, code in enumerate(inputs):
+        length, score = snake.length, snake.score
+        died = len(deaths)
+        try:
+            if code:
+                snake.next_direction = INPUTS[code]
+            game.update()
+        except Exception as error:
+            return Failure(f'exception:{type(error).__name__}', seed,
+                           inputs, tick)
+        for name, check in checks:
+            if not check(game):
+                return Failure(name, seed, inputs, tick)
+        if coverage is not None:
+            coverage.add(_feature(snake, deaths[died:], length, score))
+    return None
+
+
+def _feature(snake, deaths, length, score):
+    # Признак тика: что случилось и при какой длине змейки.
+    if deaths:
+        event = deaths[-1]
+    elif snake.score != score:
+        event = 'apple'
+    elif snake.length != length:
+        event = 'poison'
+    else:
+        event = None
+    return (event, length.bit_length(), len(snake.positions) < snake.length)
+
+
+def mutate(rng, inputs):
+    """Возвращает мутацию кодов ввода: замены, вставки или обрезку."""
+    data = bytearray(inputs)
+    for _ in range(rng.randint(1, 4)):
+        choice = rng.random()
+        position = rng.randrange(len(data) + 1)
+        if choice < 0.5 and data:
+            data[min(position, len(data) - 1)] = rng.randrange(len(INPUTS))
+        elif choice < 0.8:
+            data[position:position] = random_inputs(rng, rng.randint(1, 50))
+        else:
+            del data[position:position + rng.randint(1, 50)]
+    return bytes(data)
+
+
+def campaign(seed, ticks, invariants=INVARIANTS, case_ticks=CASE_TICKS):
+    """
+    Фаззинг с обратной связью по покрытию в одном процессе.
+
+    Случаи, давшие новые признаки покрытия, попадают в корпус и
+    дальше мутируются.
+
+    :param seed: Зерно кампании.
+    :param ticks: Сколько тиков всего проиграть.
+    :param invariants: Словарь проверяемых инвариантов.
+    :param case_ticks: Длина случайного случая.
+    :return: Словарь со статистикой и списком упавших случаев.
+    """
+    rng = random.Random(seed)
+    coverage = set()
+    corpus = []
+    failures = []
+    played = cases = 0
+    while played < ticks:
+        if corpus and rng.random() < MUTATION_SHARE:
+            game_seed, parent = rng.choice(corpus)
+            inputs = mutate(rng, parent)
+        else:
+            game_seed = rng.getrandbits(32)
+            inputs = random_inputs(rng, case_ticks)
+        known = len(coverage)
+        failure = run_case(game_seed, inputs, invariants, coverage)
+        cases += 1
+        if failure is not None:
+            played += failure.tick + 1
+            if len(failures) < MAX_FAILURES:
+                failures.append(failure)
+            continue
+        played += len(inputs)
+        if len(coverage) > known:
+            corpus.append((game_seed, inputs))
+    return {
+        'ticks': played, 'cases': cases, 'corpus': len(corpus),
+        'coverage': coverage, 'failures': failures,
+    }
+
+
+def shrink(failure, invariants=INVARIANTS):
+    """
+    Уменьшает упавший случай, сохраняя нарушенный инвариант.
+
+    Сначала отрезает ввод после падения, затем убирает и обнуляет
+    куски всё меньшего размера, пока это удаётся.
+
+    :return: Failure с минимальным найденным вводом.
+    """
+    def reproduce(inputs):
+        result = run_case(failure.seed, inputs, invariants)
+        if result is not None and result.invariant == failure.invariant:
+            return result
+        return None
+
+    best = reproduce(failure.inputs[:failure.tick + 1]) or failure
+    chunk = len(best.inputs) // 2
+    while chunk:
+        start = 0
+        while start < len(best.inputs):
+            inputs = best.inputs
+            candidates = (
+                inputs[:start] + inputs[start + chunk:],
+                inputs[:start] + bytes(len(inputs[start:start + chunk]))
+                + inputs[start + chunk:],
+            )
+            for candidate in candidates:
+                if candidate == inputs:
+                    continue
+                result = reproduce(candidate)
+                if result is not None:
+                    best = result._replace(
+                        inputs=candidate[:result.tick + 1]
+                    )
+                    break
+            else:
+                start += chunk
+        chunk //= 2
+    return best
+
+
+def save_case(path, failure):
+    """Записывает случай в файл JSON для воспроизведения."""
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({
+            'invariant': failure.invariant, 'seed': failure.seed,
+            'inputs': list(failure.inputs), 'tick': failure.tick,
+        }, file)
+
+
+def load_case(path):
+    """Читает случай, записанный save_case."""
+    with open(path, encoding='utf-8') as file:
+        data = json.load(file)
+    return Failure(data['invariant'], data['seed'], bytes(data['inputs']),
+                   data['tick'])
+
+
+def _campaign(task):
+    seed, ticks, names = task
+    invariants = {name: INVARIANTS[name] for name in names}
+    return campaign(seed, ticks, invariants)
+
+
+def fuzz(ticks, seed=0, workers=None, invariants=INVARIANTS):
+    """
+    Распределяет кампании по ядрам и объединяет результаты.
+
+    :param ticks: Сколько тиков проиграть суммарно.
+    :param seed: Зерно; кампании получают зёрна seed, seed + 1, ...
+    :param workers: Число процессов; по умолчанию число ядер.
+    :param invariants: Словарь проверяемых инвариантов.
+    :return: Словарь со статистикой и уменьшенными упавшими случаями.
+    """
+    if ticks < 1:
+        raise ValueError('Число тиков должно быть положительным.')
+    workers = workers or os.cpu_count() or 1
+    share = -(-ticks // workers)
+    tasks = [(seed + index, share, tuple(invariants))
+             for index in range(workers)]
+    if workers == 1:
+        results = [_campaign(tasks[0])]
+    else:
+        with Pool(workers) as pool:
+            results = pool.map(_campaign, tasks)
+    coverage = set()
+    failures = {}
+    for result in results:
+        coverage |= result['coverage']
+        for failure in result['failures']:
+            smallest = failures.get(failure.invariant)
+            if smallest is None or failure.tick < smallest.tick:
+                failures[failure.invariant] = failure
+    return {
+        'ticks': sum(result['ticks'] for result in results),
+        'cases': sum(result['cases'] for result in results),
+        'coverage': len(coverage),
+        'failures': [shrink(failure, invariants)
+                     for failure in failures.values()],
+    }
+
+
+def main():
+    """Запуск фаззинга из командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Фаззинг правил змейки с проверкой инвариантов.'
+    )
+    parser.add_argument('--ticks', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--skip', action='append', default=[],
+                        choices=sorted(INVARIANTS),
+                        help='не проверять инвариант')
+    parser.add_argument('--out', default='.',
+                        help='каталог для упавших случаев')
+    args = parser.parse_args()
+    if args.ticks < 1:
+        parser.error('--ticks должно быть положительным')
+    invariants = {name: check for name, check in INVARIANTS.items()
+                  if name not in args.skip}
+    started = time.perf_counter()
+    result = fuzz(args.ticks, args.seed, args.workers, invariants)
+    elapsed = time.perf_counter() - started
+    print(f'{result["ticks"]} тиков, {result["cases"]} случаев за '
+          f'{elapsed:.1f} с '
+          f'({result["ticks"] / elapsed * 60:,.0f} тиков/мин), '
+          f'признаков покрытия {result["coverage"]}')
+    for failure in result['failures']:
+        path = os.path.join(args.out, f'fuzz-{failure.invariant}.json')
+        save_case(path, failure)
+        presses = sum(1 for code in failure.inputs if code)
+        print(f'{failure.invariant}: тик {failure.tick}, зерно '
+              f'{failure.seed}, нажатий {presses} -> {path}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import os
+import random
+
+# Окно не нужно: ботам, тренерам и бенчмаркам хватает правил игры.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from snake_third import (  # noqa: E402
+    GRID_HEIGHT, GRID_SIZE, GRID_WIDTH, Apple, Game, Poison, Snake, Stone,
+    new_entity_store,
+)
+
+
+class HeadlessSnake(Snake):
+    """
+    Змейка для безголовых партий.
+
+    Дополнительно считает гибели (каждый вызов reset после создания).
+    """
+
+    def reset(self, *args, **kwargs):
+        """Сбрасывает змейку и увеличивает счётчик гибелей."""
+        super().reset(*args, **kwargs)
+        self.deaths = getattr(self, 'deaths', -1) + 1
+
+
+def new_game(seed, isolated=False):
+    """
+    Создаёт партию Game с воспроизводимой расстановкой предметов.
+
+    :param seed: Зерно генератора случайных чисел.
+    :param isolated: Расставлять предметы своим генератором партии,
+        не трогая общий random.
+    :return: Экземпляр Game со змейкой HeadlessSnake.
+    """
+    if isolated:
+        rng = random.Random(seed)
+    else:
+        random.seed(seed)
+        rng = None
+    snake = HeadlessSnake()
+    entities = new_entity_store(rng)
+    return Game(snake, [Apple(entities=entities), Poison(entities=entities),
+                        Stone(entities=entities)])
+
+
+def step(game, direction=None):
+    """
+    Выполняет один тик игры без отрисовки.
+
+    :param game: Экземпляр Game.
+    :param direction: Новое направление змейки или None.
+    """
+    if direction is not None:
+        game.snake.next_direction = direction
+    game.update()
+
+
+def cell_of(position):
+    """Переводит позицию в пикселях в координаты клетки."""
+    return position[0] // GRID_SIZE, position[1] // GRID_SIZE
+
+
+def wrapped_delta(source, target):
+    """
+    Возвращает кратчайшее смещение в клетках между позициями на торе.
+
+    :param source: Исходная позиция в пикселях.
+    :param target: Целевая позиция в пикселях.
+    """
+    dx = (target[0] - source[0]) // GRID_SIZE
+    dy = (target[1] - source[1]) // GRID_SIZE
+    dx = (dx + GRID_WIDTH // 2) % GRID_WIDTH - GRID_WIDTH // 2
+    dy = (dy + GRID_HEIGHT // 2) % GRID_HEIGHT - GRID_HEIGHT // 2
+    return dx, dy
@@ -0,0 +1,164 @@
+import time
+
+import pygame
+
+HUD_COLOR = (255, 255, 255)
+HUD_FONT_SIZE = 24
+# Отступ от края экрана и между надписями, в пикселях:
+HUD_MARGIN = 6
+
+# Сколько отрисованных текстов помнит одна надпись:
+LABEL_CACHE_SIZE = 64
+
+
+class Label:
+    """
+    Надпись, которая рендерится шрифтом только при смене текста.
+
+    Поверхности уже встречавшихся текстов хранятся в кэше, поэтому
+    значения, которые ходят туда-обратно (например FPS 9 и 10),
+    тоже не рендерятся заново.
+
+    Атрибуты:
+        surface (pygame.Surface): Поверхность с текущим текстом.
+        renders (int): Сколько раз текст рендерился шрифтом.
+    """
+
+    def __init__(self, font, template, color=HUD_COLOR):
+        """
+        Инициализация надписи.
+
+        :param font: Экземпляр pygame.font.Font.
+        :param template: Шаблон str.format с одним полем для значения.
+        :param color: Цвет текста.
+        """
+        self.font = font
+        self.template = template
+        self.color = color
+        self.text = None
+        self.surface = None
+        self.renders = 0
+        self._cache = {}
+
+    def set(self, value):
+        """
+        Подставляет значение в надпись.
+
+        :return: True, если поверхность надписи сменилась.
+        """
+        text = self.template.format(value)
+        if text == self.text:
+            return False
+        self.text = text
+        surface = self._cache.get(text)
+        if surface is None:
+            if len(self._cache) >= LABEL_CACHE_SIZE:
+                self._cache.clear()
+            surface = self.font.render(text, True, self.color)
+            if pygame.display.get_surface() is not None:
+                # Формат экрана: blit не преобразует пиксели каждый кадр.
+                surface = surface.convert_alpha()
+            self._cache[text] = surface
+            self.renders += 1
+        self.surface = surface
+        return True
+
+
+class Hud:
+    """
+    Строка счёта, длины змейки и частоты кадров поверх поля.
+
+    Рисуется одним вызовом blits в общем проходе отрисовки и не
+    обновляет экран сама.
+    """
+
+    def __init__(self, font=None, size=HUD_FONT_SIZE, color=HUD_COLOR):
+        """
+        Инициализация HUD.
+
+        :param font: Путь к файлу шрифта или None для шрифта pygame.
+        :param size: Размер шрифта.
+        :param color: Цвет текста.
+        """
+        if not pygame.font.get_init():
+            pygame.font.init()
+        self.font = pygame.font.Font(font, size)
+        self.labels = (
+            Label(self.font, 'Счёт: {}', color),
+            Label(self.font, 'Длина: {}', color),
+            Label(self.font, 'FPS: {:.0f}', color),
+        )
+        self._blits = []
+
+    def update(self, score, length, fps):
+        """
+        Обновляет значения надписей.
+
+        Раскладка пересчитывается, только если сменилась хотя бы
+        одна поверхность.
+        """
+        changed = False
+        for label, value in zip(self.labels, (score, length, fps)):
+            if label.set(value):
+                changed = True
+        if changed:
+            x = HUD_MARGIN
+            blits = []
+            for label in self.labels:
+                blits.append((label.surface, (x, HUD_MARGIN)))
+                x += label.surface.get_width() + HUD_MARGIN * 2
+            self._blits = blits
+
+    def draw(self, surface):
+        """Рисует надписи на поверхности; экран не обновляет."""
+        surface.blits(self._blits, False)
+
+    @property
+    def renders(self):
+        """Сколько раз рендерились тексты всех надписей."""
+        return sum(label.renders for label in self.labels)
+
+
+def benchmark(frames=2000, report=print):
+    """
+    Сравнивает кадр без HUD, с кэшированным HUD и с рендером каждый кадр.
+
+    :param frames: Число кадров на замер.
+    :param report: Функция вывода строки результата.
+    """
+    from headless import new_game
+    import snake_third
+
+    font = Hud().font
+
+    def naive(surface, score, length, fps):
+        x = HUD_MARGIN
+        for text in (f'Счёт: {score}', f'Длина: {length}', f'FPS: {fps:.0f}'):
+            rendered = font.render(text, True, HUD_COLOR)
+            surface.blit(rendered, (x, HUD_MARGIN))
+            x += rendered.get_width() + HUD_MARGIN * 2
+
+    results = {}
+    for label, hud in (('без HUD', None), ('кэш', Hud()),
+                       ('рендер в кадре', naive)):
+        game = new_game(0)
+        started = time.perf_counter()
+        for frame in range(frames):
+            game.update()
+            snake_third.screen.fill(snake_third.BOARD_BACKGROUND_COLOR)
+            game.draw_objects()
+            game.snake.draw()
+            fps = 10 - frame % 2
+            if isinstance(hud, Hud):
+                hud.update(game.snake.score, game.snake.length, fps)
+                hud.draw(snake_third.screen)
+            elif hud is not None:
+                hud(snake_third.screen, game.snake.score, game.snake.length,
+                    fps)
+        results[label] = (time.perf_counter() - started) / frames
+        report(f'{label:>15}: {results[label] * 1e6:8.1f} мкс/кадр')
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,166 @@
+import argparse
+import gc
+import os
+import random
+import resource
+import time
+import tracemalloc
+
+from headless import new_game, step
+from snake_third import DOWN, LEFT, RIGHT, UP
+
+# Страница памяти для пересчёта /proc/self/statm в байты:
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def current_rss():
+    """
+    Возвращает текущий резидентный размер процесса в байтах.
+
+    Без /proc (не Linux) возвращает пиковое значение.
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        return peak_rss()
+
+
+def peak_rss():
+    """Возвращает пиковый резидентный размер процесса в байтах."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MemoryMonitor:
+    """
+    Режим учёта памяти для долгих сессий.
+
+    Вызывайте tick() раз в тик игрового цикла. Монитор считает
+    временные выделения за тик, чистый прирост по местам вызова
+    (через tracemalloc), сборки мусора и RSS.
+    """
+
+    def __init__(self, sample_every=1000, frames=1):
+        """
+        Инициализация монитора.
+
+        :param sample_every: Период снятия RSS в тиках.
+        :param frames: Глубина стека для мест выделения.
+        """
+        self.sample_every = sample_every
+        self._owns_tracing = not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start(frames)
+        self.ticks = 0
+        self.transient_total = 0
+        self.transient_max = 0
+        self.traced_peak = 0
+        self.rss_samples = []
+        self._gc_start = [stats['collections'] for stats in gc.get_stats()]
+        self._baseline = tracemalloc.take_snapshot()
+        self._started = time.monotonic()
+        tracemalloc.reset_peak()
+
+    def tick(self):
+        """Учитывает завершившийся тик."""
+        current, peak = tracemalloc.get_traced_memory()
+        transient = peak - current
+        self.transient_total += transient
+        if transient > self.transient_max:
+            self.transient_max = transient
+        if peak > self.traced_peak:
+            self.traced_peak = peak
+        tracemalloc.reset_peak()
+        self.ticks += 1
+        if self.ticks % self.sample_every == 0:
+            self.rss_samples.append(current_rss())
+
+    def call_sites(self, limit=10):
+        """
+        Возвращает места вызова с наибольшим чистым приростом памяти.
+
+        :param limit: Число мест вызова.
+        :return: Список (место вызова, байт на тик, блоков на тик).
+        """
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        ticks = max(self.ticks, 1)
+        sites = []
+        for stat in snapshot.compare_to(self._baseline, 'lineno')[:limit]:
+            if not stat.size_diff:
+                continue
+            frame = stat.traceback[0]
+            sites.append((
+                f'{frame.filename}:{frame.lineno}',
+                stat.size_diff / ticks,
+                stat.count_diff / ticks,
+            ))
+        return sites
+
+    def summary(self):
+        """Возвращает словарь с итоговой статистикой памяти."""
+        collections = [
+            stats['collections'] - start
+            for stats, start in zip(gc.get_stats(), self._gc_start)
+        ]
+        samples = self.rss_samples or [current_rss()]
+        tail = samples[len(samples) // 2:]
+        return {
+            'ticks': self.ticks,
+            'seconds': time.monotonic() - self._started,
+            'transient_per_tick': self.transient_total / max(self.ticks, 1),
+            'transient_max': self.transient_max,
+            'traced_peak': self.traced_peak,
+            'gc_collections': collections,
+            'rss_steady': sum(tail) / len(tail),
+            'rss_peak': peak_rss(),
+        }
+
+    def report(self, limit=10):
+        """Печатает статистику и места вызова с приростом памяти."""
+        summary = self.summary()
+        print(f'тиков: {summary["ticks"]} '
+              f'за {summary["seconds"]:.1f} с')
+        print(f'временные выделения: '
+              f'{summary["transient_per_tick"]:.0f} байт/тик в среднем, '
+              f'{summary["transient_max"]} байт максимум')
+        print(f'пик отслеживаемой памяти: {summary["traced_peak"]} байт')
+        print(f'сборки мусора по поколениям: {summary["gc_collections"]}')
+        print(f'RSS: устойчивый {summary["rss_steady"] / 2 ** 20:.1f} МиБ, '
+              f'пиковый {summary["rss_peak"] / 2 ** 20:.1f} МиБ')
+        sites = self.call_sites(limit)
+        if not sites:
+            print('чистого прироста памяти нет')
+        for site, size, count in sites:
+            print(f'{size:+10.2f} байт/тик {count:+8.4f} блоков/тик  {site}')
+
+    def close(self):
+        """Останавливает tracemalloc, если монитор его запускал."""
+        if self._owns_tracing:
+            tracemalloc.stop()
+
+
+def main():
+    """Прогон безголовой партии с учётом памяти."""
+    parser = argparse.ArgumentParser(description='Учёт памяти змейки.')
+    parser.add_argument('--ticks', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--draw', action='store_true')
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    game = new_game(args.seed)
+    monitor = MemoryMonitor()
+    for _ in range(args.ticks):
+        turn = rng.choice((UP, DOWN, LEFT, RIGHT))
+        step(game, turn if rng.random() < 0.1 else None)
+        if args.draw:
+            game.draw()
+        monitor.tick()
+    monitor.report()
+    monitor.close()
+
+
+if __name__ == "__main__":
+    main()
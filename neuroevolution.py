@@ -0,0 +1,373 @@
+import argparse
+from array import array
+import math
+import os
+import random
+import struct
+import time
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+from headless import new_game, step, wrapped_delta
+from snake_third import GRID_HEIGHT, GRID_SIZE, GRID_WIDTH, Apple, Poison
+from snake_third import SCREEN_HEIGHT, SCREEN_WIDTH, Stone
+
+# Архитектура сети: признаки -> скрытый слой -> (налево, прямо, направо).
+INPUTS = 7
+HIDDEN = 8
+OUTPUTS = 3
+GENOME_SIZE = HIDDEN * INPUTS + HIDDEN + OUTPUTS * HIDDEN + OUTPUTS
+
+# Параметры эпизода:
+MAX_STEPS = 1000
+STARVATION_STEPS = 200
+APPLE_REWARD = 100.0
+STEP_REWARD = 0.1
+
+# Формат контрольной точки: заголовок, затем (fitness, веса) на геном.
+CHECKPOINT_MAGIC = b'SNK1'
+CHECKPOINT_HEADER = struct.Struct('<4sIII')
+
+# Разделяемый буфер весов в процессе-воркере.
+_worker_memory = None
+_worker_weights = None
+
+
+def turn_left(direction):
+    """Возвращает направление после поворота налево."""
+    return direction[1], -direction[0]
+
+
+def turn_right(direction):
+    """Возвращает направление после поворота направо."""
+    return -direction[1], direction[0]
+
+
+class Policy:
+    """
+    Маленькая полносвязная сеть, управляющая змейкой.
+
+    Атрибуты:
+        weights (list): Плоский список из GENOME_SIZE весов.
+    """
+
+    def __init__(self, weights):
+        """Инициализация политики по плоскому списку весов."""
+        self.weights = list(weights)
+
+    def decide(self, features):
+        """
+        Прогоняет признаки через сеть.
+
+        :param features: Список из INPUTS чисел.
+        :return: Индекс действия: 0 - налево, 1 - прямо, 2 - направо.
+        """
+        w = self.weights
+        offset = HIDDEN * INPUTS
+        hidden = []
+        for row in range(HIDDEN):
+            start = row * INPUTS
+            total = w[offset + row]
+            for col in range(INPUTS):
+                total += w[start + col] * features[col]
+            hidden.append(math.tanh(total))
+        offset += HIDDEN
+        bias = offset + OUTPUTS * HIDDEN
+        best_action, best_value = 0, -math.inf
+        for out in range(OUTPUTS):
+            start = offset + out * HIDDEN
+            total = w[bias + out]
+            for col in range(HIDDEN):
+                total += w[start + col] * hidden[col]
+            if total > best_value:
+                best_action, best_value = out, total
+        return best_action
+
+    def steer(self, game):
+        """
+        Выбирает следующее направление змейки в партии.
+
+        :param game: Экземпляр Game.
+        :return: Новое направление.
+        """
+        direction = game.snake.direction
+        action = self.decide(observe(game))
+        if action == 0:
+            return turn_left(direction)
+        if action == 2:
+            return turn_right(direction)
+        return direction
+
+
+def _find(game, kind):
+    for obj in game.game_objects:
+        if type(obj) is kind:
+            return obj.position
+    return None
+
+
+def _is_dangerous(game, position, stone):
+    return position == stone or position in game.snake.positions[:-1]
+
+
+def observe(game):
+    """
+    Собирает признаки для сети относительно направления змейки.
+
+    :param game: Экземпляр Game.
+    :return: Список из INPUTS чисел.
+    """
+    snake = game.snake
+    head = snake.get_head_position()
+    forward = snake.direction
+    left = turn_left(forward)
+    right = turn_right(forward)
+    stone = _find(game, Stone)
+    features = []
+    for dx, dy in (forward, left, right):
+        ahead = ((head[0] + dx * GRID_SIZE) % SCREEN_WIDTH,
+                 (head[1] + dy * GRID_SIZE) % SCREEN_HEIGHT)
+        features.append(1.0 if _is_dangerous(game, ahead, stone) else 0.0)
+    for kind in (Apple, Poison):
+        target = _find(game, kind)
+        if target is None:
+            features.extend((0.0, 0.0))
+            continue
+        dx, dy = wrapped_delta(head, target)
+        features.append((dx * forward[0] + dy * forward[1]) / GRID_WIDTH)
+        features.append((dx * right[0] + dy * right[1]) / GRID_HEIGHT)
+    return features
+
+
+def play_episode(policy, seed, max_steps=MAX_STEPS):
+    """
+    Играет одну безголовую партию до первой гибели.
+
+    :param policy: Экземпляр Policy.
+    :param seed: Зерно расстановки предметов.
+    :param max_steps: Максимальное число тиков.
+    :return: Значение приспособленности.
+    """
+    game = new_game(seed)
+    snake = game.snake
+    apples = 0
+    hungry = 0
+    steps = 0
+    while steps < max_steps and hungry < STARVATION_STEPS:
+        length = snake.length
+        step(game, policy.steer(game))
+        steps += 1
+        if snake.deaths:
+            break
+        if snake.length > length:
+            apples += 1
+            hungry = 0
+        else:
+            hungry += 1
+    return apples * APPLE_REWARD + steps * STEP_REWARD
+
+
+def _init_worker(memory_name):
+    global _worker_memory, _worker_weights
+    _worker_memory = SharedMemory(name=memory_name)
+    _worker_weights = _worker_memory.buf.cast('d')
+
+
+def _evaluate(task):
+    index, seeds, max_steps = task
+    start = index * GENOME_SIZE
+    policy = Policy(_worker_weights[start:start + GENOME_SIZE].tolist())
+    scores = [play_episode(policy, seed, max_steps) for seed in seeds]
+    return sum(scores) / len(scores)
+
+
+def save_checkpoint(path, generation, genomes):
+    """
+    Сохраняет лучшие геномы в компактном двоичном виде.
+
+    :param path: Путь к файлу контрольной точки.
+    :param generation: Номер поколения.
+    :param genomes: Список пар (fitness, веса).
+    """
+    weights_format = struct.Struct(f'<d{GENOME_SIZE}d')
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(CHECKPOINT_HEADER.pack(
+            CHECKPOINT_MAGIC, generation, GENOME_SIZE, len(genomes)
+        ))
+        for fitness, weights in genomes:
+            file.write(weights_format.pack(fitness, *weights))
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    """
+    Загружает контрольную точку.
+
+    :param path: Путь к файлу контрольной точки.
+    :return: Пара (номер поколения, список пар (fitness, веса)).
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    magic, generation, size, count = CHECKPOINT_HEADER.unpack_from(data)
+    if magic != CHECKPOINT_MAGIC or size != GENOME_SIZE:
+        raise ValueError(f'Файл {path} не является контрольной точкой.')
+    weights_format = struct.Struct(f'<d{size}d')
+    genomes = []
+    offset = CHECKPOINT_HEADER.size
+    for _ in range(count):
+        fitness, *weights = weights_format.unpack_from(data, offset)
+        genomes.append((fitness, weights))
+        offset += weights_format.size
+    return generation, genomes
+
+
+class Trainer:
+    """
+    Нейроэволюция политик змейки на пуле процессов.
+
+    Веса всей популяции лежат в разделяемой памяти, поэтому воркерам
+    передаётся только индекс генома и зёрна партий.
+    """
+
+    def __init__(self, population=64, elite=4, mutation_rate=0.1,
+                 mutation_scale=0.5, episodes=3, max_steps=MAX_STEPS,
+                 workers=None, seed=0):
+        """Инициализация тренера и разделяемого буфера весов."""
+        if population < 2:
+            raise ValueError('В популяции должно быть хотя бы два генома.')
+        if not 0 <= elite <= population:
+            raise ValueError('Число элитных геномов должно быть от 0 '
+                             'до размера популяции.')
+        self.population = population
+        self.elite = elite
+        self.mutation_rate = mutation_rate
+        self.mutation_scale = mutation_scale
+        self.episodes = episodes
+        self.max_steps = max_steps
+        self.workers = workers or os.cpu_count()
+        self.rng = random.Random(seed)
+        self.generation = 0
+        self.best = []
+        self.memory = SharedMemory(
+            create=True, size=population * GENOME_SIZE * 8
+        )
+        self.weights = self.memory.buf.cast('d')
+        try:
+            for i in range(population * GENOME_SIZE):
+                self.weights[i] = self.rng.gauss(0.0, 1.0)
+            self.pool = Pool(
+                self.workers, initializer=_init_worker,
+                initargs=(self.memory.name,),
+            )
+        except BaseException:
+            self.weights.release()
+            self.memory.close()
+            self.memory.unlink()
+            raise
+
+    def genome(self, index):
+        """Возвращает копию весов генома по индексу."""
+        start = index * GENOME_SIZE
+        return self.weights[start:start + GENOME_SIZE].tolist()
+
+    def evaluate(self):
+        """
+        Оценивает всю популяцию на общих для поколения зёрнах.
+
+        :return: Список значений приспособленности по индексам геномов.
+        """
+        seeds = [self.rng.randrange(2 ** 32) for _ in range(self.episodes)]
+        tasks = [(i, seeds, self.max_steps) for i in range(self.population)]
+        return self.pool.map(_evaluate, tasks)
+
+    def _select(self, ranked):
+        candidates = ranked[:max(2, self.population // 2)]
+        first, second = self.rng.sample(candidates, 2)
+        return first if first[0] >= second[0] else second
+
+    def breed(self, scores):
+        """
+        Формирует следующее поколение прямо в разделяемом буфере.
+
+        :param scores: Приспособленность текущего поколения.
+        """
+        ranked = sorted(
+            ((score, self.genome(i)) for i, score in enumerate(scores)),
+            key=lambda item: item[0], reverse=True,
+        )
+        self.best = ranked[:self.elite]
+        for index in range(self.population):
+            if index < self.elite:
+                child = ranked[index][1]
+            else:
+                mother = self._select(ranked)[1]
+                father = self._select(ranked)[1]
+                child = [
+                    m if self.rng.random() < 0.5 else f
+                    for m, f in zip(mother, father)
+                ]
+                for i in range(GENOME_SIZE):
+                    if self.rng.random() < self.mutation_rate:
+                        child[i] += self.rng.gauss(0.0, self.mutation_scale)
+            start = index * GENOME_SIZE
+            self.weights[start:start + GENOME_SIZE] = array('d', child)
+        self.generation += 1
+
+    def train(self, generations, checkpoint=None, report=print):
+        """
+        Запускает обучение.
+
+        :param generations: Число поколений.
+        :param checkpoint: Путь для сохранения лучших геномов или None.
+        :param report: Функция вывода строки статистики.
+        :return: Среднее число поколений в секунду.
+        """
+        started = time.perf_counter()
+        for _ in range(generations):
+            tick = time.perf_counter()
+            scores = self.evaluate()
+            self.breed(scores)
+            now = time.perf_counter()
+            if checkpoint:
+                save_checkpoint(checkpoint, self.generation, self.best)
+            report(
+                f'поколение {self.generation}: '
+                f'лучший {self.best[0][0]:.1f}, '
+                f'средний {sum(scores) / len(scores):.1f}, '
+                f'{1 / (now - tick):.2f} пок/с'
+            )
+        return generations / (time.perf_counter() - started)
+
+    def close(self):
+        """Останавливает пул и освобождает разделяемую память."""
+        self.pool.close()
+        self.pool.join()
+        self.weights.release()
+        self.memory.close()
+        self.memory.unlink()
+
+
+def main():
+    """Запуск обучения из командной строки."""
+    parser = argparse.ArgumentParser(description='Нейроэволюция змейки.')
+    parser.add_argument('--population', type=int, default=64)
+    parser.add_argument('--generations', type=int, default=50)
+    parser.add_argument('--episodes', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--checkpoint', default='best_genomes.bin')
+    args = parser.parse_args()
+    trainer = Trainer(
+        population=args.population, episodes=args.episodes,
+        workers=args.workers, seed=args.seed,
+    )
+    try:
+        rate = trainer.train(args.generations, checkpoint=args.checkpoint)
+    finally:
+        trainer.close()
+    print(f'Итого: {rate:.2f} поколений в секунду.')
+
+
+if __name__ == "__main__":
+    main()
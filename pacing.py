@@ -0,0 +1,142 @@
+import time
+
+# Стратегии ожидания кадра:
+SLEEP = 'sleep'        # clock.tick: грубый сон SDL
+BUSY = 'busy'          # clock.tick_busy_loop: сон с дожиманием в цикле
+DEADLINE = 'deadline'  # монотонные дедлайны без накопления дрейфа
+STRATEGIES = (SLEEP, BUSY, DEADLINE)
+
+# За сколько секунд до дедлайна перестаём спать и крутимся в цикле:
+SPIN_MARGIN = 0.002
+
+# Опоздание, которое ещё не считается промахом, в секундах:
+MISS_TOLERANCE = 0.001
+
+# Верхние границы корзин гистограммы джиттера, в миллисекундах:
+JITTER_BUCKETS_MS = (0.5, 1, 2, 4, 8, 16, 32, 64)
+
+# Больше стольких кадров подряд без отрисовки не пропускаем:
+MAX_SKIPPED_RENDERS = 3
+
+
+class FramePacer:
+    """
+    Выдерживает частоту кадров и ведёт статистику опозданий.
+
+    Если кадр не уложился в бюджет, следующий кадр пропускает
+    отрисовку, но не тик симуляции.
+
+    Атрибуты:
+        misses (int): Число кадров, начавшихся позже дедлайна.
+        jitter (list): Гистограмма отклонений длительности кадра.
+        skipped_renders (int): Число пропущенных отрисовок.
+    """
+
+    def __init__(self, clock, fps, strategy=DEADLINE,
+                 timer=time.perf_counter, sleep=time.sleep):
+        """
+        Инициализация планировщика кадров.
+
+        :param clock: Экземпляр pygame.time.Clock.
+        :param fps: Целевая частота кадров.
+        :param strategy: Одна из STRATEGIES.
+        :param timer: Монотонные часы в секундах.
+        :param sleep: Функция сна в секундах.
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f'Неизвестная стратегия: {strategy}')
+        self.clock = clock
+        self.fps = fps
+        self.period = 1 / fps
+        self.strategy = strategy
+        self.timer = timer
+        self.sleep = sleep
+        self.deadline = None
+        self.frame_start = None
+        self.frames = 0
+        self.misses = 0
+        self.max_lateness = 0.0
+        self.jitter = [0] * (len(JITTER_BUCKETS_MS) + 1)
+        self.skipped_renders = 0
+        self._render = True
+        self._skipped_in_row = 0
+
+    def _wait(self):
+        if self.strategy == SLEEP:
+            self.clock.tick(self.fps)
+        elif self.strategy == BUSY:
+            self.clock.tick_busy_loop(self.fps)
+        else:
+            if self.deadline is not None:
+                remaining = self.deadline - self.timer()
+                if remaining > SPIN_MARGIN:
+                    self.sleep(remaining - SPIN_MARGIN)
+                while self.timer() < self.deadline:
+                    pass
+            # Без аргумента tick не ждёт, но обновляет get_fps.
+            self.clock.tick()
+
+    def tick(self):
+        """Ждёт начала следующего кадра и обновляет статистику."""
+        work_started = self.timer()
+        self._wait()
+        now = self.timer()
+        if self.frame_start is not None:
+            self._record(now, work_started)
+        # Опоздавший кадр не догоняем серией кадров без ожидания:
+        # расписание отсчитывается заново от его фактического начала.
+        if (self.strategy != DEADLINE or self.deadline is None
+                or now - self.deadline > MISS_TOLERANCE):
+            self.deadline = now
+        self.deadline += self.period
+        self.frame_start = now
+
+    def resume(self):
+        """
+        Начинает расписание заново после паузы.
+
+        Время на паузе не считается ни промахом, ни джиттером.
+        """
+        self.deadline = None
+        self.frame_start = None
+
+    def _record(self, now, work_started):
+        self.frames += 1
+        lateness = now - self.deadline
+        if lateness > self.max_lateness:
+            self.max_lateness = lateness
+        if lateness > MISS_TOLERANCE:
+            self.misses += 1
+        deviation_ms = abs(now - self.frame_start - self.period) * 1000
+        bucket = 0
+        while (bucket < len(JITTER_BUCKETS_MS)
+               and deviation_ms > JITTER_BUCKETS_MS[bucket]):
+            bucket += 1
+        self.jitter[bucket] += 1
+        over_budget = (work_started - self.frame_start > self.period
+                       or lateness > MISS_TOLERANCE)
+        if over_budget and self._skipped_in_row < MAX_SKIPPED_RENDERS:
+            self._render = False
+            self._skipped_in_row += 1
+            self.skipped_renders += 1
+        else:
+            self._render = True
+            self._skipped_in_row = 0
+
+    def should_render(self):
+        """Возвращает False, если отрисовку этого кадра стоит пропустить."""
+        return self._render
+
+    def report(self):
+        """Возвращает статистику кадров в виде строки."""
+        labels = [f'<={edge}мс' for edge in JITTER_BUCKETS_MS]
+        labels.append(f'>{JITTER_BUCKETS_MS[-1]}мс')
+        histogram = ', '.join(
+            f'{label}: {count}' for label, count in zip(labels, self.jitter)
+        )
+        return (
+            f'кадров {self.frames}, промахов {self.misses}, '
+            f'макс. опоздание {self.max_lateness * 1000:.1f} мс, '
+            f'пропущено отрисовок {self.skipped_renders}\n'
+            f'джиттер: {histogram}'
+        )
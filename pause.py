@@ -0,0 +1,81 @@
+import pygame
+
+# Единственные типы событий, которые обрабатывает игра; остальные
+# (движение мыши и т. п.) не попадают в очередь и не будят цикл.
+GAME_EVENTS = (
+    pygame.QUIT, pygame.KEYDOWN,
+    pygame.WINDOWFOCUSLOST, pygame.WINDOWFOCUSGAINED,
+    pygame.WINDOWMINIMIZED, pygame.WINDOWRESTORED,
+)
+PAUSE_KEYS = (pygame.K_p, pygame.K_PAUSE)
+FOCUS_LOST = (pygame.WINDOWFOCUSLOST, pygame.WINDOWMINIMIZED)
+FOCUS_GAINED = (pygame.WINDOWFOCUSGAINED, pygame.WINDOWRESTORED)
+
+
+def allow_game_events():
+    """
+    Оставляет в очереди событий только GAME_EVENTS.
+
+    Вызывается до игрового цикла: заблокированные события удаляются
+    из очереди вместе с уже пришедшими.
+    """
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(GAME_EVENTS)
+
+
+class PauseControl:
+    """
+    Пауза по клавише или при потере фокуса окна.
+
+    На паузе игра не тикает и не рисует, а спит в pygame.event.wait
+    до события, которое снимает паузу.
+
+    Атрибуты:
+        paused (bool): Стоит ли игра на паузе.
+        pauses (int): Сколько раз игра вставала на паузу.
+    """
+
+    def __init__(self):
+        """Инициализация: игра не на паузе."""
+        self.paused = False
+        self.pauses = 0
+        self._by_focus = False
+
+    def handle(self, event):
+        """
+        Обрабатывает событие, если оно касается паузы.
+
+        :param event: Событие pygame.
+        :return: True, если событие обработано и дальше не нужно.
+        """
+        if event.type == pygame.KEYDOWN and event.key in PAUSE_KEYS:
+            self._pause(by_focus=False)
+            return True
+        if event.type in FOCUS_LOST:
+            self._pause(by_focus=True)
+            return True
+        return event.type in FOCUS_GAINED
+
+    def _pause(self, by_focus):
+        if not self.paused:
+            self.paused = True
+            self.pauses += 1
+            self._by_focus = by_focus
+
+    def wait(self):
+        """
+        Блокируется до снятия паузы, не занимая процессор.
+
+        Паузу по клавише снимает только клавиша паузы, паузу по
+        фокусу - также возврат фокуса. Прочие нажатия игнорируются.
+
+        :return: False, если на паузе пришёл QUIT.
+        """
+        while True:
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                return False
+            if ((event.type == pygame.KEYDOWN and event.key in PAUSE_KEYS)
+                    or (self._by_focus and event.type in FOCUS_GAINED)):
+                self.paused = False
+                return True
@@ -0,0 +1,208 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+# База статистики; переменная окружения SNAKE_STATS_DB её переопределяет
+# (например, ':memory:' в тестах и бенчмарках).
+STATS_DB = Path.home() / '.the_snake' / 'stats.sqlite3'
+
+# Сколько записей писатель вставляет одной транзакцией:
+BATCH_SIZE = 256
+
+LEADERBOARD_SIZE = 10
+
+# Причины окончания сессии:
+CAUSE_SELF = 'self'
+CAUSE_STONE = 'stone'
+CAUSE_POISON = 'poison'
+CAUSE_QUIT = 'quit'
+
+SessionRecord = namedtuple(
+    'SessionRecord',
+    ('score', 'max_length', 'duration', 'cause', 'finished_at'),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    max_length INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    cause TEXT NOT NULL,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_score
+    ON sessions (score DESC, max_length DESC);
+"""
+INSERT = (
+    'INSERT INTO sessions (score, max_length, duration, cause, finished_at) '
+    'VALUES (?, ?, ?, ?, ?)'
+)
+LEADERBOARD_QUERY = (
+    'SELECT score, max_length, duration, cause, finished_at FROM sessions '
+    'ORDER BY score DESC, max_length DESC LIMIT ?'
+)
+
+# Служебные сообщения очереди писателя:
+_STOP = object()
+
+
+def session_record(snake, cause):
+    """
+    Собирает запись о сессии по состоянию змейки перед сбросом.
+
+    :param snake: Змейка со счётчиками score, max_length и born.
+    :param cause: Причина окончания сессии.
+    """
+    now = time.time()
+    return SessionRecord(
+        snake.score, snake.max_length, time.monotonic() - snake.born,
+        cause, now,
+    )
+
+
+class SessionStore:
+    """
+    Неблокирующее хранилище статистики сессий.
+
+    Записи складываются в очередь, фоновый поток пишет их в SQLite
+    пачками в транзакциях и после каждой пачки обновляет кэш таблицы
+    рекордов. Игровой цикл никогда не ждёт диска.
+    """
+
+    def __init__(self, path=None, batch_size=BATCH_SIZE,
+                 leaderboard_size=LEADERBOARD_SIZE):
+        """
+        Инициализация хранилища и запуск потока-писателя.
+
+        :param path: Путь к базе SQLite; по умолчанию STATS_DB.
+        :param batch_size: Наибольший размер пачки вставок.
+        :param leaderboard_size: Число строк в таблице рекордов.
+        """
+        if path is None:
+            path = os.environ.get('SNAKE_STATS_DB', STATS_DB)
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.leaderboard_size = leaderboard_size
+        self.written = 0
+        self._leaderboard = ()
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name='session-writer', daemon=True
+        )
+        self._thread.start()
+
+    def record(self, record):
+        """Ставит запись в очередь на запись; не блокирует."""
+        self._queue.put(record)
+
+    def leaderboard(self):
+        """Возвращает закэшированную таблицу рекордов; не блокирует."""
+        return self._leaderboard
+
+    def flush(self, timeout=None):
+        """
+        Ждёт, пока все поставленные записи окажутся в базе.
+
+        :return: True, если писатель успел за timeout.
+        """
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=None):
+        """Дописывает очередь и останавливает поток-писатель."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def _connect(self):
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.executescript(SCHEMA)
+        return connection
+
+    def _refresh(self, connection):
+        rows = connection.execute(
+            LEADERBOARD_QUERY, (self.leaderboard_size,)
+        ).fetchall()
+        # Замена ссылки атомарна: читатели видят старую или новую таблицу.
+        self._leaderboard = tuple(SessionRecord(*row) for row in rows)
+
+    def _run(self):
+        connection = self._connect()
+        self._refresh(connection)
+        running = True
+        while running:
+            items = [self._queue.get()]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = [item for item in items
+                       if isinstance(item, SessionRecord)]
+            if records:
+                with connection:
+                    connection.executemany(INSERT, records)
+                self.written += len(records)
+                self._refresh(connection)
+            for item in items:
+                if item is _STOP:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    item.set()
+        connection.close()
+
+
+def benchmark(sessions=5000, ticks=20000, report=print):
+    """
+    Сравнивает длительность тиков с записью статистики и без неё.
+
+    :param sessions: Сколько сессий записать за прогон.
+    :param ticks: Число тиков безголовой партии.
+    :param report: Функция вывода строки результата.
+    """
+    from headless import new_game
+
+    every = max(1, ticks // sessions)
+    results = {}
+    for label, store in (('без записи', None),
+                         ('с записью', SessionStore(':memory:'))):
+        game = new_game(0)
+        times = []
+        for tick in range(ticks):
+            started = time.perf_counter()
+            game.update()
+            if store is not None and tick % every == 0:
+                store.record(session_record(game.snake, CAUSE_SELF))
+            times.append(time.perf_counter() - started)
+        if store is not None:
+            store.close()
+        times.sort()
+        results[label] = times
+        report(f'{label:>11}: среднее {sum(times) / ticks * 1e6:6.2f} мкс, '
+               f'p99 {times[int(0.99 * ticks)] * 1e6:6.2f} мкс, '
+               f'макс. {times[-1] * 1e6:8.2f} мкс')
+    return results
+
+
+def main():
+    """Печать таблицы рекордов и замер влияния записи на кадры."""
+    store = SessionStore()
+    store.flush()
+    print('Таблица рекордов:')
+    for place, row in enumerate(store.leaderboard(), 1):
+        print(f'{place:2d}. {row.score:4d} очков, длина {row.max_length}, '
+              f'{row.duration:.0f} с, {row.cause}')
+    store.close()
+    benchmark()
+
+
+if __name__ == "__main__":
+    main()
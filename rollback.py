@@ -0,0 +1,320 @@
+import argparse
+import heapq
+import random
+import struct
+import time
+
+from snake_third import DOWN, LEFT, RIGHT, UP, Apple, Poison, Snake, Stone
+from snake_third import new_entity_store
+
+# Коды ввода в сообщениях: индекс в этом кортеже.
+INPUTS = (None, UP, DOWN, LEFT, RIGHT)
+INPUT_CODES = {direction: code for code, direction in enumerate(INPUTS)}
+
+# Сообщение о вводе: номер тика и код ввода.
+INPUT_MESSAGE = struct.Struct('<IB')
+
+# Сколько тиков назад можно откатиться (и сколько снимков хранится):
+ROLLBACK_WINDOW = 32
+
+
+class DesyncError(Exception):
+    """Удалённый ввод пришёл для тика, который уже нельзя пересчитать."""
+
+
+class LatencySocket:
+    """
+    Локальная замена неблокирующего сокета с задержкой доставки.
+
+    Данные уходят собеседнику и становятся доступны recv только через
+    latency секунд (плюс случайный jitter) по часам clock. Порядок
+    байтов сохраняется, как в TCP.
+    """
+
+    def __init__(self, latency, jitter=0.0, clock=time.monotonic,
+                 rng=None):
+        """
+        Инициализация конца соединения.
+
+        :param latency: Задержка доставки в секундах.
+        :param jitter: Наибольшая случайная добавка к задержке.
+        :param clock: Часы в секундах.
+        :param rng: Генератор для jitter.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.clock = clock
+        self.rng = rng or random.Random(0)
+        self.peer = None
+        self._inbox = []
+        self._sent = 0
+        self._last_delivery = 0.0
+
+    @classmethod
+    def pair(cls, latency, jitter=0.0, clock=time.monotonic, seed=0):
+        """Возвращает два соединённых конца, как socket.socketpair."""
+        rng = random.Random(seed)
+        first = cls(latency, jitter, clock, rng)
+        second = cls(latency, jitter, clock, rng)
+        first.peer, second.peer = second, first
+        return first, second
+
+    def send(self, data):
+        """Отправляет данные собеседнику; не блокирует."""
+        delivery = self.clock() + self.latency
+        if self.jitter:
+            delivery += self.rng.uniform(0, self.jitter)
+        # Поток байтов не обгоняет сам себя.
+        delivery = max(delivery, self._last_delivery)
+        self._last_delivery = delivery
+        self._sent += 1
+        heapq.heappush(self.peer._inbox, (delivery, self._sent, bytes(data)))
+        return len(data)
+
+    sendall = send
+
+    def recv(self, bufsize):
+        """
+        Возвращает доставленные к этому моменту данные.
+
+        :raises BlockingIOError: Если доставленных данных нет.
+        """
+        now = self.clock()
+        chunks = []
+        size = 0
+        while (self._inbox and self._inbox[0][0] <= now
+               and size + len(self._inbox[0][2]) <= bufsize):
+            data = heapq.heappop(self._inbox)[2]
+            chunks.append(data)
+            size += len(data)
+        if not chunks:
+            raise BlockingIOError
+        return b''.join(chunks)
+
+    def setblocking(self, flag):
+        """Заглушка: сокет всегда неблокирующий."""
+
+
+class DuelGame:
+    """
+    Детерминированная партия нескольких змеек на общем поле.
+
+    Вся случайность идёт от собственного генератора партии, поэтому
+    одинаковые зерно и вводы дают одинаковое состояние у всех клиентов.
+    """
+
+    def __init__(self, seed, players=2):
+        """
+        Инициализация партии.
+
+        :param seed: Зерно расстановки предметов.
+        :param players: Число змеек.
+        """
+        self.rng = random.Random(seed)
+        self.entities = new_entity_store(self.rng)
+        self.game_objects = [Apple(entities=self.entities),
+                             Poison(entities=self.entities),
+                             Stone(entities=self.entities)]
+        self.snakes = [Snake() for _ in range(players)]
+
+    def step(self, inputs):
+        """
+        Выполняет один тик.
+
+        :param inputs: Направление или None для каждой змейки.
+        """
+        for snake, direction in zip(self.snakes, inputs):
+            if direction is not None:
+                snake.next_direction = direction
+            snake.move()
+            self.entities.interact(snake.get_head_position(), snake)
+
+    def snapshot(self):
+        """Возвращает неизменяемый снимок состояния партии."""
+        return (
+            tuple(
+                (tuple(snake.positions), snake.length, snake.direction,
+                 snake.next_direction, snake.last, snake.score,
+                 snake.max_length)
+                for snake in self.snakes
+            ),
+            self.entities.snapshot(),
+            self.rng.getstate(),
+        )
+
+    def restore(self, state):
+        """Возвращает партию в состояние из snapshot."""
+        snakes, cells, rng_state = state
+        for snake, saved in zip(self.snakes, snakes):
+            (positions, snake.length, snake.direction, snake.next_direction,
+             snake.last, snake.score, snake.max_length) = saved
+            snake.positions = list(positions)
+        self.entities.restore(cells)
+        self.rng.setstate(rng_state)
+
+
+class RollbackSession:
+    """
+    Клиент сетевой партии с предсказанием и откатом.
+
+    Свой ввод применяется сразу, ввод соперника до его прихода
+    предсказывается (нажатия нет). Перед каждым тиком сохраняется
+    снимок; если пришедший ввод расходится с предсказанием, партия
+    откатывается к снимку этого тика и пересчитывается до текущего.
+
+    Атрибуты:
+        tick (int): Номер следующего тика.
+        confirmed (int): Последний тик, до которого включительно
+            известны все вводы соперника.
+        rollbacks (int): Число откатов.
+        replayed (int): Число пересчитанных при откатах тиков.
+        stalls (int): Сколько раз тик пропускался в ожидании соперника.
+    """
+
+    def __init__(self, game, player, connection, window=ROLLBACK_WINDOW):
+        """
+        Инициализация клиента.
+
+        :param game: Экземпляр DuelGame на двух змейках.
+        :param player: Номер своей змейки (0 или 1).
+        :param connection: Неблокирующий сокет или LatencySocket.
+        :param window: Глубина отката в тиках.
+        """
+        if player not in (0, 1):
+            raise ValueError('Номер игрока должен быть 0 или 1.')
+        self.game = game
+        self.player = player
+        self.connection = connection
+        self.window = window
+        self.tick = 0
+        self.confirmed = -1
+        self.rollbacks = 0
+        self.replayed = 0
+        self.stalls = 0
+        self._snapshots = [None] * window
+        self._local = {}
+        self._remote = {}
+        self._predicted = {}
+        self._buffer = b''
+        self._forgotten = 0
+
+    def advance(self, direction=None):
+        """
+        Выполняет тик со своим вводом.
+
+        :param direction: Новое направление своей змейки или None.
+        :return: False, если соперник отстал больше чем на окно отката
+            и тик пропущен.
+        """
+        self._rollback(self._receive())
+        # К посчитанным подтверждённым тикам откатываться уже не придётся.
+        while self._forgotten <= min(self.confirmed, self.tick - 1):
+            self._local.pop(self._forgotten, None)
+            self._remote.pop(self._forgotten, None)
+            self._forgotten += 1
+        if self.tick - self.confirmed > self.window:
+            self.stalls += 1
+            return False
+        self._local[self.tick] = direction
+        self.connection.send(
+            INPUT_MESSAGE.pack(self.tick, INPUT_CODES[direction])
+        )
+        self._simulate(self.tick)
+        self.tick += 1
+        return True
+
+    def _receive(self):
+        while True:
+            try:
+                data = self.connection.recv(4096)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            self._buffer += data
+        size = INPUT_MESSAGE.size
+        usable = len(self._buffer) - len(self._buffer) % size
+        mispredicted = None
+        for offset in range(0, usable, size):
+            tick, code = INPUT_MESSAGE.unpack_from(self._buffer, offset)
+            direction = INPUTS[code]
+            self._remote[tick] = direction
+            if (tick in self._predicted
+                    and self._predicted.pop(tick) != direction
+                    and (mispredicted is None or tick < mispredicted)):
+                mispredicted = tick
+        self._buffer = self._buffer[usable:]
+        while self.confirmed + 1 in self._remote:
+            self.confirmed += 1
+        return mispredicted
+
+    def _rollback(self, tick):
+        if tick is None:
+            return
+        if self.tick - tick > self.window:
+            raise DesyncError(f'Тик {tick} вне окна отката.')
+        self.game.restore(self._snapshots[tick % self.window])
+        self.rollbacks += 1
+        for replay in range(tick, self.tick):
+            self._simulate(replay)
+            self.replayed += 1
+
+    def _simulate(self, tick):
+        self._snapshots[tick % self.window] = self.game.snapshot()
+        if tick in self._remote:
+            remote = self._remote[tick]
+        else:
+            remote = self._predicted[tick] = None
+        inputs = [remote, remote]
+        inputs[self.player] = self._local[tick]
+        self.game.step(inputs)
+
+
+def benchmark(ticks=3000, latency=0.1, fps=60, report=print):
+    """
+    Гоняет двух клиентов через LatencySocket на виртуальных часах.
+
+    :param ticks: Число тиков каждого клиента.
+    :param latency: Задержка в одну сторону, в секундах.
+    :param fps: Частота тиков.
+    :param report: Функция вывода строки результата.
+    """
+    now = [0.0]
+    ends = LatencySocket.pair(latency, latency / 4, lambda: now[0])
+    sessions = [RollbackSession(DuelGame(0), player, end)
+                for player, end in enumerate(ends)]
+    moves = random.Random(1)
+    worst = 0.0
+    started = time.perf_counter()
+    for _ in range(ticks):
+        now[0] += 1 / fps
+        for session in sessions:
+            direction = moves.choice(INPUTS[1:]) \
+                if moves.random() < 0.1 else None
+            frame = time.perf_counter()
+            session.advance(direction)
+            worst = max(worst, time.perf_counter() - frame)
+    elapsed = time.perf_counter() - started
+    replayed = sum(session.replayed for session in sessions)
+    rollbacks = sum(session.rollbacks for session in sessions)
+    report(f'{ticks} тиков x 2 клиента за {elapsed:.2f} с: '
+           f'откатов {rollbacks}, пересчитано тиков {replayed} '
+           f'(в среднем {replayed / max(rollbacks, 1):.1f}), '
+           f'{elapsed / (2 * ticks + replayed) * 1e6:.1f} мкс на тик, '
+           f'худший кадр {worst * 1e3:.2f} мс')
+    return sessions
+
+
+def main():
+    """Замер отката на локальном соединении с задержкой."""
+    parser = argparse.ArgumentParser(
+        description='Откат и предсказание для сетевой игры.'
+    )
+    parser.add_argument('--ticks', type=int, default=3000)
+    parser.add_argument('--latency', type=float, default=0.1)
+    args = parser.parse_args()
+    benchmark(args.ticks, args.latency)
+
+
+if __name__ == "__main__":
+    main()
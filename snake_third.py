@@ -1,6 +1,16 @@
 from random import randint
+import time
 import pygame
 
+from entities import EntityStore
+from hud import Hud
+from pacing import DEADLINE, FramePacer
+from pause import PauseControl, allow_game_events
+from persistence import (
+    CAUSE_POISON, CAUSE_QUIT, CAUSE_SELF, CAUSE_STONE, SessionStore,
+    session_record,
+)
+
 # Константы для размеров поля и сетки:
 SCREEN_WIDTH, SCREEN_HEIGHT = 1080, 640
 GRID_SIZE = 20
@@ -22,73 +32,181 @@ POISON_COLOR = (105, 0, 198)
 
 FPS = 10
 
+# Стратегия выдерживания частоты кадров (см. pacing.STRATEGIES):
+FRAME_PACING = DEADLINE
+
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Змейка")
 clock = pygame.time.Clock()
 
+# Один прямоугольник на все клетки, чтобы не создавать Rect каждый кадр:
+cell_rect = pygame.Rect(0, 0, GRID_SIZE, GRID_SIZE)
+
+# Общие таблицы кортежей клеток по размеру поля:
+_cell_tables = {}
+
+
+def cell_table():
+    """
+    Возвращает таблицу кортежей клеток для текущего размера поля.
+
+    Таблица строится один раз и общая для всех змеек: голова берётся
+    из неё, а не создаётся заново на каждом тике.
+    """
+    key = (GRID_WIDTH, GRID_HEIGHT)
+    if key not in _cell_tables:
+        _cell_tables[key] = [
+            [(x * GRID_SIZE, y * GRID_SIZE) for y in range(GRID_HEIGHT)]
+            for x in range(GRID_WIDTH)
+        ]
+    return _cell_tables[key]
+
+
+# Типы предметов в хранилище сущностей:
+APPLE, POISON, STONE = 1, 2, 3
+
+
+def random_position(rng=None):
+    """
+    Возвращает случайную позицию клетки на поле.
+
+    :param rng: Свой random.Random или None для общего генератора.
+    """
+    draw = randint if rng is None else rng.randint
+    x = draw(0, GRID_WIDTH - 1) * GRID_SIZE
+    y = draw(0, GRID_HEIGHT - 1) * GRID_SIZE
+    return (x, y)
+
+
+def eat_apple(entities, index, snake):
+    """При столкновении с яблоком змейке добавляется один сегмент."""
+    snake.length += 1
+    snake.score += 1
+    snake.max_length = max(snake.max_length, snake.length)
+    entities.place(index, random_position(entities.rng))
+
+
+def eat_poison(entities, index, snake):
+    """
+    При столкновении с ядом уменьшается длина змейки на один,
+    либо змея перезапускается, если её длина равна 1.
+    """
+    if snake.length > 1:
+        snake.length -= 1
+        snake.positions.pop()
+    else:
+        snake.reset(CAUSE_POISON)
+    entities.place(index, random_position(entities.rng))
+
+
+def hit_stone(entities, index, snake):
+    """При столкновении со стеной змейка погибает (перезапуск)."""
+    snake.reset(CAUSE_STONE)
+    entities.place(index, random_position(entities.rng))
+
+
+# Таблица взаимодействий по типу предмета:
+INTERACTIONS = {APPLE: eat_apple, POISON: eat_poison, STONE: hit_stone}
+
+
+def new_entity_store(rng=None):
+    """
+    Создаёт пустое хранилище предметов для текущего размера поля.
+
+    :param rng: Свой random.Random для расстановки предметов или None.
+    """
+    return EntityStore(GRID_WIDTH, GRID_HEIGHT, GRID_SIZE, INTERACTIONS,
+                       BORDER_COLOR, rng)
+
 
 class GameObj:
-    def __init__(self, body_color):
-        self.body_color = body_color
-        self.position = None
+    """
+    Предмет на поле: тонкое представление записи в EntityStore.
+
+    Тип, клетка и цвет хранятся в массивах хранилища, объект помнит
+    только своё хранилище и индекс в нём. Без общего хранилища
+    объект получает собственное.
+    """
+
+    kind = None
+
+    def __init__(self, body_color, entities=None):
+        self.entities = entities if entities is not None \
+            else new_entity_store()
+        self.index = self.entities.add(self.kind, body_color)
         self.rand_pos()
 
+    @property
+    def position(self):
+        """Позиция объекта в пикселях."""
+        return self.entities.position(self.index)
+
+    @position.setter
+    def position(self, value):
+        self.entities.place(self.index, value)
+
+    @property
+    def body_color(self):
+        """Цвет объекта."""
+        return self.entities.color(self.index)
+
+    @body_color.setter
+    def body_color(self, value):
+        self.entities.set_color(self.index, value)
+
     def rand_pos(self):
         """Устанавливает случайную позицию объекта."""
-        x = randint(0, GRID_WIDTH - 1) * GRID_SIZE
-        y = randint(0, GRID_HEIGHT - 1) * GRID_SIZE
-        self.position = (x, y)
+        self.position = random_position(self.entities.rng)
 
     def draw(self):
         """Отрисовывает объект на экране."""
-        rect = pygame.Rect(self.position, (GRID_SIZE, GRID_SIZE))
-        pygame.draw.rect(screen, self.body_color, rect)
-        pygame.draw.rect(screen, BORDER_COLOR, rect, 1)
+        cell_rect.topleft = self.position
+        pygame.draw.rect(screen, self.body_color, cell_rect)
+        pygame.draw.rect(screen, BORDER_COLOR, cell_rect, 1)
 
     def interact(self, snake):
-        """
-        Метод взаимодействия объекта со змейкой.
-        Должен быть переопределён в наследниках.
-        """
-        pass
+        """Взаимодействие со змейкой по таблице типа объекта."""
+        self.entities.dispatch(self.index, snake)
 
 
 class Apple(GameObj):
-    def __init__(self, body_color=APPLE_COLOR):
-        super().__init__(body_color)
+    kind = APPLE
 
-    def interact(self, snake):
-        """При столкновении с яблоком змейке добавляется один сегмент."""
-        snake.length += 1
-        self.rand_pos()
+    def __init__(self, body_color=APPLE_COLOR, entities=None):
+        super().__init__(body_color, entities)
 
 
 class Poison(GameObj):
-    def __init__(self, body_color=POISON_COLOR):
-        super().__init__(body_color)
+    kind = POISON
 
-    def interact(self, snake):
-        """
-        При столкновении с ядом уменьшается длина змейки на один,
-        либо змея перезапускается, если её длина равна 1.
-        """
-        if snake.length > 1:
-            snake.length -= 1
-            snake.positions.pop()
-        else:
-            snake.reset()
-        self.rand_pos()
+    def __init__(self, body_color=POISON_COLOR, entities=None):
+        super().__init__(body_color, entities)
 
 
 class Stone(GameObj):
-    def __init__(self, body_color=(122, 127, 128)):
-        super().__init__(body_color)
+    kind = STONE
 
-    def interact(self, snake):
-        """При столкновении со стеной змейка погибает (перезапуск)."""
-        snake.reset()
-        self.rand_pos()
+    def __init__(self, body_color=(122, 127, 128), entities=None):
+        super().__init__(body_color, entities)
+
+
+def shared_entities(game_objects):
+    """
+    Возвращает общее хранилище предметов или None.
+
+    Хранилище общее, если все предметы лежат в нём и других
+    сущностей в нём нет.
+    """
+    if not game_objects:
+        return None
+    entities = getattr(game_objects[0], 'entities', None)
+    if entities is None or len(entities) != len(game_objects):
+        return None
+    for obj in game_objects:
+        if getattr(obj, 'entities', None) is not entities:
+            return None
+    return entities
 
 
 class PlayerControl:
@@ -109,12 +227,25 @@ class PlayerControl:
 
 
 class Snake(PlayerControl):
+    # Вызывается с причиной гибели до сброса счётчиков сессии.
+    on_death = None
+
     def __init__(self, body_color=SNAKE_COLOR):
         super().__init__(body_color)
+        self.cells = cell_table()
         self.reset()
 
-    def reset(self):
-        """Сбрасывает состояние змейки."""
+    def reset(self, cause=None):
+        """
+        Сбрасывает состояние змейки.
+
+        :param cause: Причина гибели или None при создании змейки.
+        """
+        if cause is not None and self.on_death is not None:
+            self.on_death(cause)
+        self.score = 0
+        self.max_length = 1
+        self.born = time.monotonic()
         self.length = 1
         self.positions = [((SCREEN_WIDTH // 2), (SCREEN_HEIGHT // 2))]
         self.direction = RIGHT
@@ -135,10 +266,14 @@ class Snake(PlayerControl):
         self.update_direction()
         current = self.positions[0]
         dx, dy = self.direction
-        new_position = ((current[0] + dx * GRID_SIZE) % SCREEN_WIDTH,
-                        (current[1] + dy * GRID_SIZE) % SCREEN_HEIGHT)
-        if new_position in self.positions[2:]:
-            self.reset()
+        new_position = self.cells[(current[0] // GRID_SIZE + dx) % GRID_WIDTH][
+            (current[1] // GRID_SIZE + dy) % GRID_HEIGHT
+        ]
+        # Сегменты не повторяются, поэтому индекс первого вхождения
+        # заменяет проверку по срезу positions[2:] без копирования списка.
+        if (new_position in self.positions
+                and self.positions.index(new_position) > 1):
+            self.reset(CAUSE_SELF)
         else:
             self.positions.insert(0, new_position)
             if len(self.positions) > self.length:
@@ -153,15 +288,12 @@ class Snake(PlayerControl):
     def draw(self):
         """Отрисовывает змейку на экране."""
         if self.last:
-            last_rect = pygame.Rect(self.last, (GRID_SIZE, GRID_SIZE))
-            pygame.draw.rect(screen, BOARD_BACKGROUND_COLOR, last_rect)
-        head_rect = pygame.Rect(self.positions[0], (GRID_SIZE, GRID_SIZE))
-        pygame.draw.rect(screen, self.body_color, head_rect)
-        pygame.draw.rect(screen, BORDER_COLOR, head_rect, 1)
-        for pos in self.positions[1:]:
-            rect = pygame.Rect(pos, (GRID_SIZE, GRID_SIZE))
-            pygame.draw.rect(screen, self.body_color, rect)
-            pygame.draw.rect(screen, BORDER_COLOR, rect, 1)
+            cell_rect.topleft = self.last
+            pygame.draw.rect(screen, BOARD_BACKGROUND_COLOR, cell_rect)
+        for pos in self.positions:
+            cell_rect.topleft = pos
+            pygame.draw.rect(screen, self.body_color, cell_rect)
+            pygame.draw.rect(screen, BORDER_COLOR, cell_rect, 1)
 
     def handle_input(self, event):
         """Обрабатывает нажатия клавиш для управления направлением змейки."""
@@ -182,46 +314,88 @@ class Game:
     Здесь внедряются зависимости: змейка и список объектов,
     с которыми она может взаимодействовать.
     """
-    def __init__(self, snake, game_objects):
+    def __init__(self, snake, game_objects, store=None, hud=None):
         self.snake = snake #вот тут высокоуровневый модуль Game не будет зависеть на прямую от PC
         self.game_objects = game_objects
+        # Общее хранилище позволяет обновлять и рисовать предметы пачкой.
+        self.entities = shared_entities(game_objects)
         self.running = True
+        self.pacer = FramePacer(clock, FPS, FRAME_PACING)
+        self.pause = PauseControl()
+        # HUD необязателен: безголовым партиям он не нужен.
+        self.hud = hud
+        # Хранилище статистики тоже внедряется извне и может отсутствовать.
+        self.store = store
+        if store is not None:
+            snake.on_death = self.finish_session
+
+    def finish_session(self, cause):
+        """Записывает статистику закончившейся сессии в хранилище."""
+        self.store.record(session_record(self.snake, cause))
 
     def process_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
-            else:
+            elif not self.pause.handle(event):
                 self.snake.handle_input(event)
 
     def update(self):
         self.snake.move()
         head_pos = self.snake.get_head_position()
+        if self.entities is not None:
+            self.entities.interact(head_pos, self.snake)
+            return
         for obj in self.game_objects:
             if head_pos == obj.position:
                 obj.interact(self.snake)
 
-    def draw(self):
-        screen.fill(BOARD_BACKGROUND_COLOR)
+    def draw_objects(self):
+        """Рисует предметы: пачкой из хранилища или по одному."""
+        if self.entities is not None:
+            self.entities.draw(screen)
+            return
         for obj in self.game_objects:
             obj.draw()
+
+    def draw(self):
+        screen.fill(BOARD_BACKGROUND_COLOR)
+        self.draw_objects()
         self.snake.draw()
+        if self.hud is not None:
+            self.hud.update(self.snake.score, self.snake.length,
+                            self.pacer.clock.get_fps())
+            self.hud.draw(screen)
         pygame.display.flip()
 
     def run(self):
         while self.running:
-            clock.tick(FPS)
+            self.pacer.tick()
             self.process_events()
+            if self.pause.paused and self.running:
+                # На паузе спим в ожидании события, а не крутим цикл.
+                self.running = self.pause.wait()
+                self.pacer.resume()
+                continue
             self.update()
-            self.draw()
+            # При нехватке времени пропускаем отрисовку, но не тик симуляции.
+            if self.pacer.should_render():
+                self.draw()
+        if self.store is not None:
+            self.finish_session(CAUSE_QUIT)
+            self.store.close()
         pygame.quit()
 
 
 def main():
     snake = Snake()
-    game_objects = [Apple(), Poison(), Stone()]
+    entities = new_entity_store()
+    game_objects = [Apple(entities=entities), Poison(entities=entities),
+                    Stone(entities=entities)]
 
-    game = Game(snake, game_objects)
+    # Снятие блокировки чистит очередь, поэтому делаем это до цикла.
+    allow_game_events()
+    game = Game(snake, game_objects, SessionStore(), Hud())
     game.run()
 
 
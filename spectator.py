@@ -0,0 +1,432 @@
+import argparse
+import struct
+import time
+from collections import deque
+from multiprocessing.shared_memory import SharedMemory
+
+import pygame
+
+from snake_third import (
+    BOARD_BACKGROUND_COLOR, BORDER_COLOR, GRID_HEIGHT, GRID_SIZE, GRID_WIDTH,
+    SNAKE_COLOR, Apple, Game, Poison, Snake, Stone,
+)
+
+# Типы кадров:
+KEYFRAME = 0
+DELTA = 1
+
+# Клетка, которой нет (например, хвост не сдвинулся):
+NO_CELL = 255
+
+KEYFRAME_INTERVAL = 64
+
+FRAME_HEADER = struct.Struct('<BI')
+DELTA_BODY = struct.Struct('<BBBBB')
+ITEM_MOVE = struct.Struct('<BBB')
+KEYFRAME_ITEM = struct.Struct('<BBBBB')
+
+# Кольцевой буфер: заголовок (записано кадров, номер последнего ключевого),
+# затем слоты (номер кадра + 1, длина, данные).
+RING_HEADER = struct.Struct('<QQ')
+SLOT_HEADER = struct.Struct('<QH')
+RING_SLOTS = 256
+MAX_ITEMS = 255
+MAX_FRAME_SIZE = (
+    FRAME_HEADER.size + 2 + 2 * GRID_WIDTH * GRID_HEIGHT
+    + 1 + KEYFRAME_ITEM.size * MAX_ITEMS
+)
+
+
+def to_cell(position):
+    """Переводит позицию в пикселях в клетку поля."""
+    return position[0] // GRID_SIZE, position[1] // GRID_SIZE
+
+
+def encode_keyframe(tick, positions, items):
+    """
+    Кодирует полное состояние партии.
+
+    :param tick: Номер тика.
+    :param positions: Сегменты змейки, начиная с головы.
+    :param items: Список пар (позиция, цвет) предметов.
+    :return: Кадр в виде bytes.
+    """
+    parts = [FRAME_HEADER.pack(KEYFRAME, tick),
+             struct.pack('<H', len(positions))]
+    for position in positions:
+        parts.append(bytes(to_cell(position)))
+    parts.append(bytes((len(items),)))
+    for position, color in items:
+        parts.append(KEYFRAME_ITEM.pack(*to_cell(position), *color))
+    return b''.join(parts)
+
+
+def encode_delta(tick, head, tail, moves):
+    """
+    Кодирует изменение за один тик.
+
+    :param tick: Номер тика.
+    :param head: Новая позиция головы.
+    :param tail: Освободившаяся позиция хвоста или None.
+    :param moves: Список пар (индекс предмета, новая позиция).
+    :return: Кадр в виде bytes.
+    """
+    tail_cell = to_cell(tail) if tail is not None else (NO_CELL, NO_CELL)
+    parts = [FRAME_HEADER.pack(DELTA, tick),
+             DELTA_BODY.pack(*to_cell(head), *tail_cell, len(moves))]
+    for index, position in moves:
+        parts.append(ITEM_MOVE.pack(index, *to_cell(position)))
+    return b''.join(parts)
+
+
+class FrameRing:
+    """
+    Кольцевой буфер кадров в разделяемой памяти.
+
+    Издатель пишет каждый кадр один раз, зрители читают его независимо,
+    поэтому стоимость публикации не зависит от числа зрителей.
+    """
+
+    def __init__(self, name=None, slots=RING_SLOTS,
+                 slot_size=MAX_FRAME_SIZE):
+        """
+        Создаёт новый буфер или подключается к существующему.
+
+        :param name: Имя существующего буфера или None для создания.
+        :param slots: Число слотов.
+        :param slot_size: Максимальный размер кадра.
+        """
+        self.slots = slots
+        self.slot_stride = SLOT_HEADER.size + slot_size
+        self.slot_size = slot_size
+        size = RING_HEADER.size + slots * self.slot_stride
+        if name is None:
+            self.memory = SharedMemory(create=True, size=size)
+            RING_HEADER.pack_into(self.memory.buf, 0, 0, 0)
+        else:
+            self.memory = SharedMemory(name=name)
+        self.name = self.memory.name
+        self.buf = self.memory.buf
+
+    def _slot_offset(self, seq):
+        return RING_HEADER.size + (seq % self.slots) * self.slot_stride
+
+    def write(self, frame, keyframe=False):
+        """
+        Записывает кадр в очередной слот.
+
+        :param frame: Кадр в виде bytes.
+        :param keyframe: Является ли кадр ключевым.
+        """
+        if len(frame) > self.slot_size:
+            raise ValueError('Кадр не помещается в слот буфера.')
+        seq, last_keyframe = RING_HEADER.unpack_from(self.buf, 0)
+        offset = self._slot_offset(seq)
+        # Сначала помечаем слот как занятый, затем пишем данные.
+        SLOT_HEADER.pack_into(self.buf, offset, 0, 0)
+        start = offset + SLOT_HEADER.size
+        self.buf[start:start + len(frame)] = frame
+        SLOT_HEADER.pack_into(self.buf, offset, seq + 1, len(frame))
+        if keyframe:
+            last_keyframe = seq
+        RING_HEADER.pack_into(self.buf, 0, seq + 1, last_keyframe)
+
+    def read(self, seq):
+        """
+        Читает кадр по номеру.
+
+        :param seq: Номер кадра.
+        :return: Кадр в виде bytes или None, если слот уже перезаписан.
+        """
+        offset = self._slot_offset(seq)
+        marker, length = SLOT_HEADER.unpack_from(self.buf, offset)
+        if marker != seq + 1:
+            return None
+        start = offset + SLOT_HEADER.size
+        frame = bytes(self.buf[start:start + length])
+        if SLOT_HEADER.unpack_from(self.buf, offset)[0] != seq + 1:
+            return None
+        return frame
+
+    def cursor(self):
+        """Возвращает пару (записано кадров, номер последнего ключевого)."""
+        return RING_HEADER.unpack_from(self.buf, 0)
+
+    def close(self, unlink=False):
+        """
+        Отключается от буфера.
+
+        :param unlink: Удалить ли разделяемую память (делает создатель).
+        """
+        self.buf.release()
+        self.memory.close()
+        if unlink:
+            self.memory.unlink()
+
+
+class Publisher:
+    """Публикует тики партии Game в кольцевой буфер кадров."""
+
+    def __init__(self, game, ring, keyframe_interval=KEYFRAME_INTERVAL):
+        """
+        Инициализация издателя.
+
+        :param game: Экземпляр Game.
+        :param ring: Экземпляр FrameRing.
+        :param keyframe_interval: Период ключевых кадров в тиках.
+        """
+        if keyframe_interval >= ring.slots:
+            raise ValueError('Период ключевых кадров должен быть меньше '
+                             'числа слотов буфера.')
+        self.game = game
+        self.ring = ring
+        self.keyframe_interval = keyframe_interval
+        self.tick = 0
+        self._remember()
+        self._publish_keyframe()
+
+    def _remember(self):
+        positions = self.game.snake.positions
+        self._head = positions[0]
+        self._tail = positions[-1]
+        self._length = len(positions)
+        self._items = [obj.position for obj in self.game.game_objects]
+
+    def _publish_keyframe(self):
+        items = [(obj.position, obj.body_color)
+                 for obj in self.game.game_objects]
+        frame = encode_keyframe(self.tick, self.game.snake.positions, items)
+        self.ring.write(frame, keyframe=True)
+
+    def _tail_change(self, positions):
+        """Возвращает (описывается ли тик дельтой, освободившийся хвост)."""
+        length = len(positions)
+        if length == 1 and self._length == 1:
+            return True, self._tail
+        if length < 2 or positions[1] != self._head:
+            return False, None
+        if length == self._length:
+            return True, self._tail
+        if length == self._length + 1:
+            return True, None
+        return False, None
+
+    def publish(self):
+        """Кодирует и публикует очередной тик партии."""
+        self.tick += 1
+        positions = self.game.snake.positions
+        is_delta, tail = self._tail_change(positions)
+        if not is_delta or self.tick % self.keyframe_interval == 0:
+            self._publish_keyframe()
+        else:
+            moves = [
+                (index, obj.position)
+                for index, obj in enumerate(self.game.game_objects)
+                if obj.position != self._items[index]
+            ]
+            frame = encode_delta(self.tick, positions[0], tail, moves)
+            self.ring.write(frame)
+        self._remember()
+
+
+class Viewer:
+    """
+    Зритель: восстанавливает состояние партии по кадрам из буфера.
+
+    Опоздавший зритель начинает с последнего ключевого кадра.
+    """
+
+    def __init__(self, ring):
+        """Инициализация зрителя над буфером FrameRing."""
+        self.ring = ring
+        self.seq = None
+        self.tick = None
+        self.body = deque()
+        self.items = []
+        self.colors = []
+        self.syncs = 0
+
+    def poll(self):
+        """
+        Применяет все новые кадры.
+
+        :return: Число применённых кадров.
+        """
+        applied = 0
+        # Не больше одной пересинхронизации за вызов: если и ключевой
+        # кадр уже перезаписан, ждём следующего в очередном poll.
+        for _ in range(2):
+            written, last_keyframe = self.ring.cursor()
+            if self.seq is None or written - self.seq > self.ring.slots:
+                self.seq = last_keyframe
+                self.syncs += 1
+            while self.seq < written:
+                frame = self.ring.read(self.seq)
+                if frame is None:
+                    # Издатель обогнал зрителя.
+                    self.seq = None
+                    break
+                self.apply(frame)
+                self.seq += 1
+                applied += 1
+            else:
+                return applied
+        return applied
+
+    def apply(self, frame):
+        """
+        Применяет один кадр к состоянию.
+
+        :param frame: Кадр в виде bytes.
+        """
+        kind, tick = FRAME_HEADER.unpack_from(frame)
+        offset = FRAME_HEADER.size
+        if kind == KEYFRAME:
+            self._apply_keyframe(frame, offset)
+        elif self.tick is not None:
+            self._apply_delta(frame, offset)
+        else:
+            return
+        self.tick = tick
+
+    def _apply_keyframe(self, frame, offset):
+        (length,) = struct.unpack_from('<H', frame, offset)
+        offset += 2
+        cells = frame[offset:offset + 2 * length]
+        self.body = deque(zip(cells[0::2], cells[1::2]))
+        offset += 2 * length
+        count = frame[offset]
+        offset += 1
+        self.items = []
+        self.colors = []
+        for _ in range(count):
+            x, y, *color = KEYFRAME_ITEM.unpack_from(frame, offset)
+            self.items.append((x, y))
+            self.colors.append(tuple(color))
+            offset += KEYFRAME_ITEM.size
+
+    def _apply_delta(self, frame, offset):
+        hx, hy, tx, ty, count = DELTA_BODY.unpack_from(frame, offset)
+        offset += DELTA_BODY.size
+        self.body.appendleft((hx, hy))
+        if tx != NO_CELL:
+            self.body.pop()
+        for _ in range(count):
+            index, x, y = ITEM_MOVE.unpack_from(frame, offset)
+            self.items[index] = (x, y)
+            offset += ITEM_MOVE.size
+
+    def draw(self, surface):
+        """
+        Отрисовывает восстановленное состояние.
+
+        :param surface: Поверхность pygame.
+        """
+        surface.fill(BOARD_BACKGROUND_COLOR)
+        rect = pygame.Rect(0, 0, GRID_SIZE, GRID_SIZE)
+        cells = list(zip(self.items, self.colors))
+        cells.extend((cell, SNAKE_COLOR) for cell in self.body)
+        for (x, y), color in cells:
+            rect.topleft = (x * GRID_SIZE, y * GRID_SIZE)
+            pygame.draw.rect(surface, color, rect)
+            pygame.draw.rect(surface, BORDER_COLOR, rect, 1)
+
+
+class SpectatedGame(Game):
+    """Партия, которая публикует каждый тик для зрителей."""
+
+    def __init__(self, snake, game_objects, ring):
+        """Инициализация партии и издателя."""
+        super().__init__(snake, game_objects)
+        self.publisher = Publisher(self, ring)
+
+    def update(self):
+        """Обновляет партию и публикует тик."""
+        super().update()
+        self.publisher.publish()
+
+
+def benchmark(viewer_counts=(1, 10, 100, 500), ticks=2000, report=print):
+    """
+    Измеряет стоимость публикации при разном числе зрителей.
+
+    :param viewer_counts: Набор чисел зрителей.
+    :param ticks: Число тиков на замер.
+    :param report: Функция вывода строки результата.
+    :return: Словарь {число зрителей: мкс публикации на тик}.
+    """
+    results = {}
+    for count in viewer_counts:
+        ring = FrameRing()
+        game = Game(Snake(), [Apple(), Poison(), Stone()])
+        publisher = Publisher(game, ring)
+        viewers = [Viewer(ring) for _ in range(count)]
+        publish_time = 0.0
+        view_time = 0.0
+        for _ in range(ticks):
+            game.update()
+            started = time.perf_counter()
+            publisher.publish()
+            publish_time += time.perf_counter() - started
+            started = time.perf_counter()
+            for viewer in viewers:
+                viewer.poll()
+            view_time += time.perf_counter() - started
+        del viewers
+        ring.close(unlink=True)
+        results[count] = publish_time / ticks * 1e6
+        report(
+            f'зрителей {count:4d}: публикация {results[count]:7.2f} мкс/тик, '
+            f'зрители {view_time / ticks / count * 1e6:7.2f} мкс/тик каждый'
+        )
+    return results
+
+
+def watch(name, fps=30):
+    """
+    Показывает трансляцию из буфера с заданным именем.
+
+    :param name: Имя разделяемой памяти FrameRing.
+    :param fps: Частота перерисовки.
+    """
+    ring = FrameRing(name=name)
+    viewer = Viewer(ring)
+    screen = pygame.display.get_surface()
+    clock = pygame.time.Clock()
+    running = True
+    while running:
+        clock.tick(fps)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+        viewer.poll()
+        viewer.draw(screen)
+        pygame.display.flip()
+    ring.close()
+    pygame.quit()
+
+
+def main():
+    """Запуск трансляции, просмотра или замера из командной строки."""
+    parser = argparse.ArgumentParser(description='Трансляция партии.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('publish')
+    watch_parser = commands.add_parser('watch')
+    watch_parser.add_argument('name')
+    commands.add_parser('bench')
+    args = parser.parse_args()
+    if args.command == 'watch':
+        watch(args.name)
+    elif args.command == 'bench':
+        benchmark()
+    else:
+        ring = FrameRing()
+        print(f'Буфер трансляции: {ring.name}')
+        try:
+            SpectatedGame(Snake(), [Apple(), Poison(), Stone()], ring).run()
+        finally:
+            ring.close(unlink=True)
+
+
+if __name__ == "__main__":
+    main()
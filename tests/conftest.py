@@ -13,6 +13,8 @@ sys.path.append(str(BASE_DIR))
 
 # Hide the pygame screen
 os.environ['SDL_VIDEODRIVER'] = 'dummy'
+# Keep session statistics out of the user's database
+os.environ['SNAKE_STATS_DB'] = ':memory:'
 
 TIMEOUT_ASSERT_MSG = (
     'Проект работает некорректно, проверка прервана.\n'
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+import autopilot
+import snake_third
+from headless import HeadlessSnake
+
+
+@pytest.mark.parametrize('width, height', ((2, 2), (5, 5), (6, 4), (54, 32)))
+def test_cycle_visits_every_cell_through_neighbours(width, height):
+    tables = autopilot.build_tables(width, height)
+    assert sorted(tables.cycle) == list(range(width * height))
+    for index, cell in enumerate(tables.cycle):
+        following = tables.cycle[(index + 1) % tables.size]
+        assert following in tables.neighbours[cell * 4:cell * 4 + 4], (
+            f'Клетки {cell} и {following} цикла должны быть соседними '
+            'на торе.'
+        )
+
+
+def test_tables_are_cached_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(autopilot, '_tables', {})
+    built = autopilot.tables_for(7, 5, tmp_path)
+    assert (tmp_path / 'hamilton-7x5.bin').exists()
+    monkeypatch.setattr(autopilot, '_tables', {})
+    monkeypatch.setattr(autopilot, 'build_tables', None)
+    loaded = autopilot.tables_for(7, 5, tmp_path)
+    for name in ('order', 'cycle', 'neighbours', 'skips'):
+        assert getattr(loaded, name) == getattr(built, name), (
+            f'Таблица `{name}` должна читаться из кэша без изменений.'
+        )
+
+
+@pytest.mark.parametrize('width, height', ((8, 6), (7, 5)))
+def test_autopilot_fills_small_board(width, height, tmp_path, monkeypatch):
+    board = {
+        'GRID_WIDTH': width, 'GRID_HEIGHT': height,
+        'SCREEN_WIDTH': width * snake_third.GRID_SIZE,
+        'SCREEN_HEIGHT': height * snake_third.GRID_SIZE,
+    }
+    for name, value in board.items():
+        monkeypatch.setattr(snake_third, name, value)
+    random.seed(0)
+    entities = snake_third.new_entity_store()
+    game = autopilot.AttractGame(
+        HeadlessSnake(), [snake_third.Apple(entities=entities)],
+        autopilot.Autopilot(autopilot.build_tables(width, height),
+                            snake_third.GRID_SIZE),
+    )
+    cells = width * height
+    for _ in range(cells * cells):
+        game.update()
+        if game.snake.length == cells - 1:
+            break
+    assert game.snake.deaths == 0, 'Автопилот не должен погибать.'
+    assert game.snake.length == cells - 1, (
+        'Автопилот должен заполнить почти всё поле.'
+    )
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+import snake_third
+from bitboard import Bitboard, bfs_reachable, popcount, random_body
+
+
+def test_shifts_wrap_like_snake_move():
+    board = Bitboard(5, 4)
+    corner = board.bit(4, 3)
+    assert board.east(corner) == board.bit(0, 3)
+    assert board.south(corner) == board.bit(4, 0)
+    assert board.west(board.bit(0, 0)) == board.bit(4, 0)
+    assert board.north(board.bit(0, 0)) == board.bit(0, 3)
+
+
+@pytest.mark.parametrize('width, height', ((54, 32), (7, 5), (10, 10)))
+def test_reachability_matches_bfs(width, height):
+    rng = random.Random(width)
+    board = Bitboard(width, height)
+    for _ in range(100):
+        body = random_body(width, height,
+                           rng.randint(1, width * height // 2), rng)
+        growth = rng.randint(0, 3)
+        blocked = [(rng.randrange(width), rng.randrange(height))
+                   for _ in range(rng.randint(0, 10))]
+        blocked = [cell for cell in blocked if cell not in body]
+        bits = board.reachable(body[0], body, growth,
+                               board.from_cells(blocked))
+        assert set(board.cells(bits)) == bfs_reachable(
+            width, height, body[0], body, growth, blocked
+        ), 'Битборд должен давать те же клетки, что и обход в ширину.'
+
+
+def test_regions_split_by_walls():
+    board = Bitboard(6, 6)
+    # Стены в столбцах 0 и 3 режут тор на две полосы по 12 клеток.
+    walls = board.from_cells([(x, y) for x in (0, 3) for y in range(6)])
+    regions = board.regions(board.full & ~walls)
+    assert sorted(popcount(region) for region in regions) == [12, 12]
+
+
+def test_move_into_dead_end_is_trap():
+    board = Bitboard(6, 6)
+    # Свободны кольцо строки 0 и тупик из двух клеток под (2, 0).
+    free = board.from_cells([(x, 0) for x in range(6)] + [(2, 1), (2, 2)])
+    walls = board.full & ~free
+    body = [(2, 0), (1, 0), (0, 0)]
+    assert board.is_trap((2, 0), (0, 1), body, blocked=walls), (
+        'Ход в тупик меньше длины змейки должен считаться ловушкой.'
+    )
+    assert not board.is_trap((2, 0), (1, 0), body, blocked=walls)
+    assert board.is_trap((2, 0), (-1, 0), body, blocked=walls)
+
+
+def test_snake_cells_count_pending_growth():
+    snake = snake_third.Snake()
+    snake.length = 4
+    board = Bitboard(snake_third.GRID_WIDTH, snake_third.GRID_HEIGHT)
+    body, growth = board.snake_cells(snake, snake_third.GRID_SIZE)
+    assert len(body) == 1 and growth == 3
@@ -0,0 +1,29 @@
+import pytest
+
+import crossbench
+
+
+def test_class_based_implementations_are_equivalent():
+    runs = crossbench.compare(
+        ticks=300, seed=4, modules=('the_snake_second', 'snake_third')
+    )
+    expected = runs['snake_third'].states
+    assert len(expected) == 300
+    assert crossbench.first_divergence(
+        expected, runs['the_snake_second'].states
+    ) is None, (
+        'Реализации `the_snake_second` и `snake_third` должны совпадать '
+        'на каждом тике.'
+    )
+
+
+def test_summary_reports_frame_times():
+    runs = crossbench.compare(ticks=50, seed=1, modules=('the_snake',))
+    stats = crossbench.summarize(runs['the_snake'])
+    assert stats['ticks_per_sec'] > 0
+    assert stats['p50'] <= stats['p95'] <= stats['p99'] <= stats['max']
+
+
+def test_zero_ticks_is_rejected():
+    with pytest.raises(ValueError):
+        crossbench.compare(ticks=0)
@@ -0,0 +1,71 @@
+import random
+
+import pygame
+
+import snake_third
+from headless import HeadlessSnake, step
+
+DIRECTIONS = (snake_third.UP, snake_third.DOWN, snake_third.LEFT,
+              snake_third.RIGHT)
+
+
+def _objects(entities=None):
+    return [snake_third.Apple(entities=entities),
+            snake_third.Poison(entities=entities),
+            snake_third.Stone(entities=entities)]
+
+
+def _play(shared, ticks=3000):
+    random.seed(7)
+    entities = snake_third.new_entity_store() if shared else None
+    game = snake_third.Game(HeadlessSnake(), _objects(entities))
+    assert (game.entities is not None) == shared
+    moves = random.Random(1)
+    states = []
+    for _ in range(ticks):
+        step(game, moves.choice(DIRECTIONS))
+        states.append((tuple(game.snake.positions), game.snake.length,
+                       tuple(obj.position for obj in game.game_objects)))
+    return states
+
+
+def test_store_matches_per_object_loop():
+    assert _play(shared=True) == _play(shared=False), (
+        'Пакетное обновление через хранилище должно совпадать с обходом '
+        'предметов по одному.'
+    )
+
+
+def test_overlapping_items_interact_in_list_order():
+    entities = snake_third.new_entity_store()
+    apple, poison, _ = _objects(entities)
+    snake = HeadlessSnake()
+    head = snake.get_head_position()
+    apple.position = poison.position = head
+    entities.interact(head, snake)
+    assert snake.length == 1 and snake.score == 1 and snake.deaths == 0, (
+        'Яблоко и яд в одной клетке должны сработать оба, яблоко первым.'
+    )
+    assert apple.position != head or poison.position != head
+
+
+def _pixels(draw):
+    snake_third.screen.fill(snake_third.BOARD_BACKGROUND_COLOR)
+    draw()
+    return pygame.image.tostring(snake_third.screen, 'RGB')
+
+
+def test_batched_draw_matches_objects():
+    random.seed(3)
+    entities = snake_third.new_entity_store()
+    objects = _objects(entities) + _objects(entities)
+    objects[4].position = objects[0].position
+    game = snake_third.Game(HeadlessSnake(), objects)
+
+    def one_by_one():
+        for obj in objects:
+            obj.draw()
+
+    assert _pixels(game.draw_objects) == _pixels(one_by_one), (
+        'Отрисовка пачками должна давать ту же картинку, что и по одному.'
+    )
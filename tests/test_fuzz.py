@@ -0,0 +1,42 @@
+import random
+
+import fuzz
+
+
+def _short_snake(game):
+    # Искусственный «баг»: змейка не должна дорастать до 3 сегментов.
+    return game.snake.length < 3
+
+
+PLANTED = {'short_snake': _short_snake}
+
+
+def test_fuzzer_finds_and_shrinks_planted_violation(tmp_path):
+    result = fuzz.campaign(0, 200_000, PLANTED)
+    assert result['failures'], 'Фаззер должен найти нарушение инварианта.'
+    found = result['failures'][0]
+    small = fuzz.shrink(found, PLANTED)
+    assert len(small.inputs) <= found.tick + 1
+    assert sum(map(bool, small.inputs)) <= sum(map(bool, found.inputs))
+    path = tmp_path / 'case.json'
+    fuzz.save_case(path, small)
+    replayed = fuzz.run_case(small.seed, fuzz.load_case(path).inputs, PLANTED)
+    assert replayed == small, (
+        'Уменьшенный случай должен воспроизводиться из файла.'
+    )
+
+
+def test_cases_are_deterministic():
+    inputs = fuzz.random_inputs(random.Random(1), 2000)
+    first, second = set(), set()
+    assert (fuzz.run_case(7, inputs, PLANTED, first)
+            == fuzz.run_case(7, inputs, PLANTED, second))
+    assert first == second
+
+
+def test_parallel_run_merges_campaigns():
+    invariants = {name: check for name, check in fuzz.INVARIANTS.items()
+                  if name != 'items_on_free_cells'}
+    result = fuzz.fuzz(20_000, seed=3, workers=2, invariants=invariants)
+    assert result['ticks'] >= 20_000
+    assert result['coverage'] > 1, 'Кампании должны набрать покрытие.'
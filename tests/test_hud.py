@@ -0,0 +1,29 @@
+from hud import Hud
+from headless import new_game
+import snake_third
+
+
+def test_labels_render_only_when_text_changes():
+    hud = Hud()
+    for frame in range(1000):
+        hud.update(3, 4, 10 - frame % 2 + 0.25)
+        hud.draw(snake_third.screen)
+    assert hud.renders == 4, (
+        'Надпись должна рендериться шрифтом только для нового текста.'
+    )
+
+
+def test_game_draws_hud_without_extra_renders():
+    game = new_game(0)
+    game.hud = Hud()
+    scores, lengths = set(), set()
+    for _ in range(500):
+        game.update()
+        game.draw()
+        scores.add(game.snake.score)
+        lengths.add(game.snake.length)
+    fps_texts = len(game.hud.labels[2]._cache)
+    assert game.hud.renders <= len(scores) + len(lengths) + fps_texts, (
+        'HUD должен рендерить текст только при смене счёта, длины или FPS.'
+    )
+    assert game.hud.labels[0].text == f'Счёт: {game.snake.score}'
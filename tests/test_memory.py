@@ -0,0 +1,81 @@
+import tracemalloc
+
+import pytest
+
+import snake_third
+from headless import new_game
+
+STEADY_TICKS = 10_000
+WARMUP_TICKS = 100
+
+
+def _park_off_row(objects, snake, module):
+    # Предметы вне ряда змейки: она не растёт и не погибает.
+    head_row = snake.get_head_position()[1]
+    for index, obj in enumerate(objects):
+        obj.position = (index * module.GRID_SIZE,
+                        (head_row + module.GRID_SIZE) % module.SCREEN_HEIGHT)
+
+
+def _snake_third_tick():
+    game = new_game(0)
+    game.snake.length = 5
+    _park_off_row(game.game_objects, game.snake, snake_third)
+
+    def tick():
+        game.update()
+        game.draw()
+    return tick, game.snake
+
+
+def _the_snake_tick(module):
+    snake = module.Snake()
+    snake.length = 5
+    items = [module.Apple(), module.Poison(), module.Stone()]
+    _park_off_row(items, snake, module)
+
+    def tick():
+        # Шаг цикла main() без ожидания и обработки событий.
+        snake.move()
+        module.screen.fill(module.BOARD_BACKGROUND_COLOR)
+        for obj in items:
+            obj.draw()
+        snake.draw()
+        module.pygame.display.update()
+    return tick, snake
+
+
+def _net_growth(tick, filename):
+    for _ in range(WARMUP_TICKS):
+        tick()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for _ in range(STEADY_TICKS):
+            tick()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    only_game = (tracemalloc.Filter(True, filename),)
+    return [
+        stat for stat in after.filter_traces(only_game).compare_to(
+            before.filter_traces(only_game), 'lineno'
+        )
+        if stat.size_diff
+    ]
+
+
+@pytest.mark.parametrize('module_name', ('snake_third', 'the_snake'))
+def test_hot_loop_has_no_net_allocations(module_name, _the_snake):
+    if module_name == 'the_snake':
+        module = _the_snake
+        tick, snake = _the_snake_tick(module)
+    else:
+        module = snake_third
+        tick, snake = _snake_third_tick()
+    growth = _net_growth(tick, module.__file__)
+    assert not growth, (
+        f'За {STEADY_TICKS} тиков `move`/`draw` в `{module_name}` не должны '
+        f'накапливать память: {growth}'
+    )
+    assert len(snake.positions) == 5
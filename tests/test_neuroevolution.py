@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+import neuroevolution
+
+
+def test_checkpoint_roundtrip(tmp_path):
+    rng = random.Random(1)
+    genomes = [
+        (float(i), [rng.gauss(0, 1) for _ in range(neuroevolution.GENOME_SIZE)])
+        for i in range(3)
+    ]
+    path = tmp_path / 'best.bin'
+    neuroevolution.save_checkpoint(path, 7, genomes)
+    assert neuroevolution.load_checkpoint(path) == (7, genomes), (
+        'Контрольная точка должна восстанавливать поколение и геномы.'
+    )
+
+
+def test_episode_is_reproducible():
+    rng = random.Random(2)
+    policy = neuroevolution.Policy(
+        rng.gauss(0, 1) for _ in range(neuroevolution.GENOME_SIZE)
+    )
+    first = neuroevolution.play_episode(policy, seed=5, max_steps=300)
+    second = neuroevolution.play_episode(policy, seed=5, max_steps=300)
+    assert first == second, (
+        'Партия с одним и тем же зерном должна давать одинаковый результат.'
+    )
+
+
+def test_trainer_runs_generation():
+    trainer = neuroevolution.Trainer(
+        population=6, elite=2, episodes=1, max_steps=50, workers=1
+    )
+    try:
+        rate = trainer.train(1, report=lambda line: None)
+    finally:
+        trainer.close()
+    assert rate > 0
+    assert trainer.generation == 1
+    assert len(trainer.best) == 2
+
+
+def test_small_population_trains():
+    trainer = neuroevolution.Trainer(
+        population=2, elite=1, episodes=1, max_steps=20, workers=1
+    )
+    try:
+        trainer.train(2, report=lambda line: None)
+    finally:
+        trainer.close()
+    assert trainer.generation == 2
+
+
+def test_invalid_population_is_rejected():
+    with pytest.raises(ValueError):
+        neuroevolution.Trainer(population=1, elite=0, workers=1)
+    with pytest.raises(ValueError):
+        neuroevolution.Trainer(population=4, elite=5, workers=1)
@@ -0,0 +1,87 @@
+import pytest
+
+import pacing
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+
+    def timer(self):
+        # Время идёт и во время активного ожидания.
+        self.now += 0.0001
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeClock:
+    def __init__(self, fake_time):
+        self.fake_time = fake_time
+        self.calls = 0
+
+    def tick(self, fps=0):
+        self.calls += 1
+        return 0
+
+    tick_busy_loop = tick
+
+
+@pytest.fixture
+def fake_time():
+    return FakeTime()
+
+
+def _pacer(fake_time, strategy=pacing.DEADLINE, fps=10):
+    return pacing.FramePacer(
+        FakeClock(fake_time), fps, strategy,
+        timer=fake_time.timer, sleep=fake_time.sleep,
+    )
+
+
+def test_deadline_strategy_keeps_schedule(fake_time):
+    pacer = _pacer(fake_time)
+    starts = []
+    for _ in range(5):
+        pacer.tick()
+        starts.append(fake_time.now)
+        fake_time.now += 0.03
+    assert starts == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4], abs=0.001)
+    assert pacer.misses == 0
+    assert pacer.jitter[0] == pacer.frames == 4
+    assert pacer.clock.calls == 5, (
+        'Каждый кадр должен вызывать `clock.tick`.'
+    )
+
+
+def test_slow_frame_skips_render_not_simulation(fake_time):
+    pacer = _pacer(fake_time)
+    pacer.tick()
+    fake_time.now += 0.25
+    pacer.tick()
+    assert pacer.misses == 1
+    assert not pacer.should_render(), (
+        'Кадр после превышения бюджета должен пропустить отрисовку.'
+    )
+    # Расписание отсчитывается от опоздавшего кадра, без серии догоняющих.
+    pacer.tick()
+    assert fake_time.now == pytest.approx(0.35, abs=0.001)
+    assert pacer.should_render()
+    assert pacer.misses == 1
+    assert pacer.skipped_renders == 1
+
+
+def test_long_pause_resets_schedule(fake_time):
+    pacer = _pacer(fake_time)
+    pacer.tick()
+    fake_time.now += 5
+    pacer.tick()
+    resumed = fake_time.now
+    pacer.tick()
+    assert fake_time.now == pytest.approx(resumed + 0.1, abs=0.001)
+
+
+def test_unknown_strategy(fake_time):
+    with pytest.raises(ValueError):
+        _pacer(fake_time, strategy='nap')
@@ -0,0 +1,62 @@
+import threading
+import time
+
+import pygame
+import pytest
+
+import snake_third
+from headless import new_game
+from pause import PauseControl, allow_game_events
+
+
+def _key(key):
+    return pygame.event.Event(pygame.KEYDOWN, key=key)
+
+
+@pytest.fixture
+def game_events():
+    pygame.event.clear()
+    allow_game_events()
+    yield
+    pygame.event.set_allowed(None)
+    pygame.event.clear()
+
+
+def test_only_handled_events_are_queued(game_events):
+    pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(1, 1)))
+    pygame.event.post(_key(pygame.K_UP))
+    assert [event.type for event in pygame.event.get()] == [pygame.KEYDOWN], (
+        'В очередь должны попадать только события, которые обрабатывает игра.'
+    )
+
+
+def test_paused_game_sleeps_in_event_wait(game_events):
+    pause = PauseControl()
+    assert pause.handle(_key(pygame.K_p)) and pause.paused
+    # Возврат фокуса не снимает паузу, поставленную клавишей.
+    pygame.event.post(pygame.event.Event(pygame.WINDOWFOCUSGAINED))
+    timer = threading.Timer(0.3, pygame.event.post, (_key(pygame.K_p),))
+    timer.start()
+    cpu, wall = time.process_time(), time.perf_counter()
+    assert pause.wait() and not pause.paused
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    timer.join()
+    assert wall >= 0.25, 'Пауза должна длиться до нажатия клавиши паузы.'
+    assert cpu < 0.1 * wall, f'На паузе игра заняла {cpu:.3f} с процессора.'
+
+
+def test_run_stops_simulation_while_paused(game_events, monkeypatch):
+    monkeypatch.setattr(pygame, 'quit', lambda: None)
+    game = new_game(0)
+    ticks = []
+    monkeypatch.setattr(game, 'update', lambda: ticks.append(1))
+    pygame.event.post(pygame.event.Event(pygame.WINDOWFOCUSLOST))
+    timer = threading.Timer(0.2, pygame.event.post,
+                            (pygame.event.Event(pygame.QUIT),))
+    timer.start()
+    game.run()
+    timer.join()
+    assert not ticks, 'На паузе симуляция не должна тикать.'
+    assert game.pause.pauses == 1
+    assert snake_third.screen.get_size() == (snake_third.SCREEN_WIDTH,
+                                             snake_third.SCREEN_HEIGHT)
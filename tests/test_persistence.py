@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+import persistence
+import snake_third
+from headless import new_game
+
+
+@pytest.fixture
+def store(tmp_path):
+    session_store = persistence.SessionStore(tmp_path / 'stats.sqlite3')
+    yield session_store
+    session_store.close()
+
+
+def _record(score, cause=persistence.CAUSE_SELF):
+    return persistence.SessionRecord(score, score + 1, 1.0, cause, 0.0)
+
+
+def test_records_are_batched_and_ranked(store):
+    started = time.perf_counter()
+    for score in range(2000):
+        store.record(_record(score % 97))
+    elapsed = time.perf_counter() - started
+    assert store.flush(timeout=10)
+    assert store.written == 2000
+    assert [row.score for row in store.leaderboard()] == [96] * 10, (
+        'Таблица рекордов должна обновляться после записи пачки.'
+    )
+    assert elapsed < 0.5, 'Запись сессии не должна ждать базу данных.'
+
+
+def test_leaderboard_survives_restart(tmp_path):
+    path = tmp_path / 'stats.sqlite3'
+    first = persistence.SessionStore(path)
+    first.record(_record(5, persistence.CAUSE_STONE))
+    first.close()
+    second = persistence.SessionStore(path)
+    second.flush(timeout=10)
+    second.close()
+    assert second.leaderboard()[0].cause == persistence.CAUSE_STONE
+
+
+@pytest.mark.parametrize('kind, cause', (
+    (snake_third.Stone, persistence.CAUSE_STONE),
+    (snake_third.Poison, persistence.CAUSE_POISON),
+))
+def test_game_records_death_cause(store, kind, cause):
+    game = new_game(0)
+    game = snake_third.Game(game.snake, game.game_objects, store)
+    snake = game.snake
+    apple = next(obj for obj in game.game_objects if type(obj) is snake_third.Apple)
+    apple.interact(snake)
+    ahead = snake.cells[
+        (snake.get_head_position()[0] // snake_third.GRID_SIZE + 1)
+        % snake_third.GRID_WIDTH
+    ][snake.get_head_position()[1] // snake_third.GRID_SIZE]
+    for obj in game.game_objects:
+        obj.position = (0, 0)
+        if type(obj) is kind:
+            obj.position = ahead
+    if kind is snake_third.Poison:
+        snake.length = 1
+    game.update()
+    assert store.flush(timeout=10)
+    (row,) = store.leaderboard()
+    assert row.cause == cause
+    assert row.score == 1
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from rollback import (
+    INPUTS, DesyncError, DuelGame, LatencySocket, RollbackSession,
+)
+
+FPS = 60
+
+
+def _inputs(seed, ticks):
+    rng = random.Random(seed)
+    return [rng.choice(INPUTS[1:]) if rng.random() < 0.2 else None
+            for _ in range(ticks)]
+
+
+def _play(latency, ticks=600, drain=30, jitter=0.0):
+    now = [0.0]
+    ends = LatencySocket.pair(latency, jitter, lambda: now[0])
+    sessions = [RollbackSession(DuelGame(5), player, end)
+                for player, end in enumerate(ends)]
+    inputs = [_inputs(player, ticks) + [None] * drain for player in (0, 1)]
+    for tick in range(ticks + drain):
+        now[0] += 1 / FPS
+        for session, own in zip(sessions, inputs):
+            assert session.advance(own[tick])
+    return sessions, inputs
+
+
+@pytest.mark.parametrize('latency, jitter', ((0.0, 0.0), (0.1, 0.05)))
+def test_clients_converge_to_lockstep_state(latency, jitter):
+    sessions, inputs = _play(latency, jitter=jitter)
+    reference = DuelGame(5)
+    for tick in range(sessions[0].tick):
+        reference.step([inputs[0][tick], inputs[1][tick]])
+    for session in sessions:
+        assert session.game.snapshot() == reference.snapshot(), (
+            'После отката клиенты должны прийти к тому же состоянию, '
+            'что и партия со всеми вводами.'
+        )
+    if latency:
+        assert all(session.rollbacks for session in sessions), (
+            'С задержкой предсказания должны ошибаться и откатываться.'
+        )
+
+
+def test_snapshot_restore_round_trip():
+    game = DuelGame(3)
+    moves = _inputs(9, 200)
+    for direction in moves[:100]:
+        game.step([direction, None])
+    saved = game.snapshot()
+    for direction in moves[100:]:
+        game.step([direction, None])
+    game.restore(saved)
+    assert game.snapshot() == saved
+
+
+def test_lagging_peer_stalls_instead_of_desync():
+    ends = LatencySocket.pair(10.0, clock=lambda: 0.0)
+    session = RollbackSession(DuelGame(0), 0, ends[0], window=8)
+    results = [session.advance() for _ in range(12)]
+    assert results == [True] * 8 + [False] * 4, (
+        'Без ответа соперника клиент не должен уходить дальше окна отката.'
+    )
+    assert session.stalls == 4
+    with pytest.raises(DesyncError):
+        session._rollback(session.tick - session.window - 1)
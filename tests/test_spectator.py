@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+import spectator
+from headless import new_game, step
+from snake_third import DOWN, LEFT, RIGHT, UP
+
+
+def _state(game):
+    body = [spectator.to_cell(position) for position in game.snake.positions]
+    items = [spectator.to_cell(obj.position) for obj in game.game_objects]
+    return body, items
+
+
+def _viewer_state(viewer):
+    return list(viewer.body), list(viewer.items)
+
+
+@pytest.fixture
+def ring():
+    frame_ring = spectator.FrameRing(slots=32)
+    yield frame_ring
+    frame_ring.close(unlink=True)
+
+
+def test_viewers_follow_game(ring):
+    rng = random.Random(3)
+    game = new_game(3)
+    publisher = spectator.Publisher(game, ring, keyframe_interval=16)
+    viewer = spectator.Viewer(ring)
+    slow_viewer = spectator.Viewer(ring)
+    late_viewer = None
+    for tick in range(1, 600):
+        step(game, rng.choice((UP, DOWN, LEFT, RIGHT, None, None)))
+        publisher.publish()
+        viewer.poll()
+        assert _viewer_state(viewer) == _state(game), (
+            f'Зритель разошёлся с партией на тике {tick}.'
+        )
+        if tick == 250:
+            late_viewer = spectator.Viewer(ring)
+        if late_viewer is not None:
+            late_viewer.poll()
+            assert _viewer_state(late_viewer) == _state(game)
+        if tick % 100 == 0:
+            slow_viewer.poll()
+            assert _viewer_state(slow_viewer) == _state(game), (
+                'Отставший зритель должен синхронизироваться '
+                'по ключевому кадру.'
+            )
+    assert slow_viewer.syncs > 1
+
+
+def test_keyframe_interval_must_fit_ring(ring):
+    with pytest.raises(ValueError):
+        spectator.Publisher(new_game(1), ring, keyframe_interval=32)
+
+
+def test_viewer_waits_when_keyframe_is_overwritten(ring):
+    game = new_game(1)
+    publisher = spectator.Publisher(game, ring, keyframe_interval=16)
+    for _ in range(20):
+        step(game)
+        publisher.publish()
+    # Имитируем перезапись слота последнего ключевого кадра.
+    _, last_keyframe = ring.cursor()
+    offset = ring._slot_offset(last_keyframe)
+    ring.buf[offset:offset + 8] = bytes(8)
+    viewer = spectator.Viewer(ring)
+    assert viewer.poll() == 0
+    assert viewer.tick is None
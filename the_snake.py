@@ -1,6 +1,15 @@
 from random import randint
+import time
 import pygame
 
+from hud import Hud
+from pacing import DEADLINE, FramePacer
+from pause import PauseControl, allow_game_events
+from persistence import (
+    CAUSE_POISON, CAUSE_QUIT, CAUSE_SELF, CAUSE_STONE, SessionStore,
+    session_record,
+)
+
 # Константы для размеров поля и сетки:
 SCREEN_WIDTH, SCREEN_HEIGHT = 640, 480
 GRID_SIZE = 20
@@ -23,6 +32,9 @@ POISON_COLOR = (105, 0, 198)  # Цвет для яда
 # Скорость движения змейки:
 SPEED = 7.5
 
+# Стратегия выдерживания частоты кадров (см. pacing.STRATEGIES):
+FRAME_PACING = DEADLINE
+
 # Инициализация Pygame
 pygame.init()
 
@@ -33,17 +45,42 @@ pygame.display.set_caption("Змейка")
 # Настройка времени:
 clock = pygame.time.Clock()
 
+# Один прямоугольник на все клетки, чтобы не создавать Rect каждый кадр:
+cell_rect = pygame.Rect(0, 0, GRID_SIZE, GRID_SIZE)
+
+# Общие таблицы кортежей клеток по размеру поля:
+_cell_tables = {}
+
+
+def cell_table():
+    """
+    Возвращает таблицу кортежей клеток для текущего размера поля.
 
-def handle_keys(game_object):
+    Таблица строится один раз и общая для всех змеек: голова берётся
+    из неё, а не создаётся заново на каждом тике.
+    """
+    key = (GRID_WIDTH, GRID_HEIGHT)
+    if key not in _cell_tables:
+        _cell_tables[key] = [
+            [(x * GRID_SIZE, y * GRID_SIZE) for y in range(GRID_HEIGHT)]
+            for x in range(GRID_WIDTH)
+        ]
+    return _cell_tables[key]
+
+
+def handle_keys(game_object, pause=None):
     """
     Обрабатывает нажатия клавиш для изменения направления движения змейки.
 
     :param game_object: Экземпляр класса Snake.
+    :param pause: Экземпляр PauseControl или None.
     """
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             pygame.quit()
             raise SystemExit
+        elif pause is not None and pause.handle(event):
+            continue
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_UP and game_object.direction != DOWN:
                 game_object.next_direction = UP
@@ -95,9 +132,9 @@ class Apple(GameObject):
 
     def draw(self):
         """Отрисовывает яблоко на экране."""
-        rect = pygame.Rect(self.position, (GRID_SIZE, GRID_SIZE))
-        pygame.draw.rect(screen, self.body_color, rect)
-        pygame.draw.rect(screen, BORDER_COLOR, rect, 1)
+        cell_rect.topleft = self.position
+        pygame.draw.rect(screen, self.body_color, cell_rect)
+        pygame.draw.rect(screen, BORDER_COLOR, cell_rect, 1)
 
 
 class Poison(Apple):
@@ -119,15 +156,33 @@ class Stone(Apple):
 
 
 class Snake(GameObject):
-    """Класс, описывающий змейку."""
+    """
+    Класс, описывающий змейку.
+
+    Атрибуты:
+        on_death: Функция, вызываемая с причиной гибели до сброса
+            счётчиков сессии (score, max_length, born).
+    """
+
+    on_death = None
 
     def __init__(self, body_color=SNAKE_COLOR):
         """Инициализация змейки."""
         super().__init__(body_color=body_color)
+        self.cells = cell_table()
         self.reset()
 
-    def reset(self):
-        """Сбрасывает состояние змейки."""
+    def reset(self, cause=None):
+        """
+        Сбрасывает состояние змейки.
+
+        :param cause: Причина гибели или None при создании змейки.
+        """
+        if cause is not None and self.on_death is not None:
+            self.on_death(cause)
+        self.score = 0
+        self.max_length = 1
+        self.born = time.monotonic()
         self.length = 1
         self.positions = [((SCREEN_WIDTH // 2), (SCREEN_HEIGHT // 2))]
         self.direction = RIGHT
@@ -148,12 +203,16 @@ class Snake(GameObject):
         self.update_direction()
         current = self.positions[0]
         x, y = self.direction
-        new_position = (
-            (current[0] + (x * GRID_SIZE)) % SCREEN_WIDTH,
-            (current[1] + (y * GRID_SIZE)) % SCREEN_HEIGHT,
-        )
-        if new_position in self.positions[2:]:
-            self.reset()
+        new_position = self.cells[
+            (current[0] // GRID_SIZE + x) % GRID_WIDTH
+        ][
+            (current[1] // GRID_SIZE + y) % GRID_HEIGHT
+        ]
+        # Сегменты не повторяются, поэтому индекс первого вхождения
+        # заменяет проверку по срезу positions[2:] без копирования списка.
+        if (new_position in self.positions
+                and self.positions.index(new_position) > 1):
+            self.reset(CAUSE_SELF)
         else:
             self.positions.insert(0, new_position)
             if len(self.positions) > self.length:
@@ -168,17 +227,39 @@ class Snake(GameObject):
     def draw(self):
         """Отрисовывает змейку на экране."""
         if self.last:
-            last_rect = pygame.Rect(self.last, (GRID_SIZE, GRID_SIZE))
-            pygame.draw.rect(screen, BOARD_BACKGROUND_COLOR, last_rect)
+            cell_rect.topleft = self.last
+            pygame.draw.rect(screen, BOARD_BACKGROUND_COLOR, cell_rect)
+
+        for position in self.positions:
+            cell_rect.topleft = position
+            pygame.draw.rect(screen, self.body_color, cell_rect)
+            pygame.draw.rect(screen, BORDER_COLOR, cell_rect, 1)
 
-        head_rect = pygame.Rect(self.positions[0], (GRID_SIZE, GRID_SIZE))
-        pygame.draw.rect(screen, self.body_color, head_rect)
-        pygame.draw.rect(screen, BORDER_COLOR, head_rect, 1)
 
-        for position in self.positions[1:]:
-            rect = pygame.Rect(position, (GRID_SIZE, GRID_SIZE))
-            pygame.draw.rect(screen, self.body_color, rect)
-            pygame.draw.rect(screen, BORDER_COLOR, rect, 1)
+def handle_collisions(snake, apple, poison, stone):
+    """
+    Обрабатывает столкновение головы змейки с предметами.
+
+    :param snake: Экземпляр класса Snake.
+    :param apple: Яблоко.
+    :param poison: Яд.
+    :param stone: Камень.
+    """
+    if snake.get_head_position() == apple.position:
+        snake.length += 1
+        snake.score += 1
+        snake.max_length = max(snake.max_length, snake.length)
+        apple.randomize_position()
+    elif snake.get_head_position() == poison.position:
+        if snake.length > 1:
+            snake.length -= 1
+            snake.positions.pop()
+        else:
+            snake.reset(CAUSE_POISON)
+        poison.randomize_position()
+    elif snake.get_head_position() == stone.position:
+        snake.reset(CAUSE_STONE)
+        stone.randomize_position()
 
 
 def main():
@@ -187,29 +268,39 @@ def main():
     apple = Apple()
     poison = Poison()
     stone = Stone()
-    while True:
-        clock.tick(SPEED)
-        screen.fill(BOARD_BACKGROUND_COLOR)
-        handle_keys(snake)
-        snake.move()
-        if snake.get_head_position() == apple.position:
-            snake.length += 1
-            apple.randomize_position()
-        elif snake.get_head_position() == poison.position:
-            if snake.length > 1:
-                snake.length -= 1
-                snake.positions.pop()
-            else:
-                snake.reset()
-            poison.randomize_position()
-        elif snake.get_head_position() == stone.position:
-            snake.reset()
-            stone.randomize_position()
-        stone.draw()
-        snake.draw()
-        poison.draw()
-        apple.draw()
-        pygame.display.update()
+    pacer = FramePacer(clock, SPEED, FRAME_PACING)
+    hud = Hud()
+    pause = PauseControl()
+    allow_game_events()
+    store = SessionStore()
+    snake.on_death = lambda cause: store.record(session_record(snake, cause))
+    try:
+        while True:
+            pacer.tick()
+            handle_keys(snake, pause)
+            if pause.paused:
+                # На паузе спим в ожидании события, а не крутим цикл.
+                if not pause.wait():
+                    pygame.quit()
+                    raise SystemExit
+                pacer.resume()
+                continue
+            snake.move()
+            handle_collisions(snake, apple, poison, stone)
+            # При нехватке времени пропускаем отрисовку, но не тик симуляции.
+            if pacer.should_render():
+                screen.fill(BOARD_BACKGROUND_COLOR)
+                stone.draw()
+                snake.draw()
+                poison.draw()
+                apple.draw()
+                hud.update(snake.score, snake.length, clock.get_fps())
+                hud.draw(screen)
+                pygame.display.update()
+    finally:
+        # Запись не ждёт диска; close лишь дописывает очередь при выходе.
+        store.record(session_record(snake, CAUSE_QUIT))
+        store.close()
 
 
 if __name__ == "__main__":
@@ -1,6 +1,9 @@
 from random import randint
 import pygame
 
+from pacing import DEADLINE, FramePacer
+from pause import PauseControl, allow_game_events
+
 # Константы для размеров поля и сетки:
 SCREEN_WIDTH, SCREEN_HEIGHT = 1080, 640
 GRID_SIZE = 20
@@ -22,11 +25,36 @@ POISON_COLOR = (105, 0, 198)
 
 FPS = 10
 
+# Стратегия выдерживания частоты кадров (см. pacing.STRATEGIES):
+FRAME_PACING = DEADLINE
+
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Змейка")
 clock = pygame.time.Clock()
 
+# Один прямоугольник на все клетки, чтобы не создавать Rect каждый кадр:
+cell_rect = pygame.Rect(0, 0, GRID_SIZE, GRID_SIZE)
+
+# Общие таблицы кортежей клеток по размеру поля:
+_cell_tables = {}
+
+
+def cell_table():
+    """
+    Возвращает таблицу кортежей клеток для текущего размера поля.
+
+    Таблица строится один раз и общая для всех змеек: голова берётся
+    из неё, а не создаётся заново на каждом тике.
+    """
+    key = (GRID_WIDTH, GRID_HEIGHT)
+    if key not in _cell_tables:
+        _cell_tables[key] = [
+            [(x * GRID_SIZE, y * GRID_SIZE) for y in range(GRID_HEIGHT)]
+            for x in range(GRID_WIDTH)
+        ]
+    return _cell_tables[key]
+
 
 class GameObj:
     def __init__(self, body_color):
@@ -42,9 +70,9 @@ class GameObj:
 
     def draw(self):
         """Отрисовывает объект на экране."""
-        rect = pygame.Rect(self.position, (GRID_SIZE, GRID_SIZE))
-        pygame.draw.rect(screen, self.body_color, rect)
-        pygame.draw.rect(screen, BORDER_COLOR, rect, 1)
+        cell_rect.topleft = self.position
+        pygame.draw.rect(screen, self.body_color, cell_rect)
+        pygame.draw.rect(screen, BORDER_COLOR, cell_rect, 1)
 
     def interact(self, snake):
         """
@@ -112,6 +140,7 @@ class PlayerControl:
 class Snake(PlayerControl):
     def __init__(self, body_color=SNAKE_COLOR):
         super().__init__(body_color)
+        self.cells = cell_table()
         self.reset()
 
     def reset(self):
@@ -135,9 +164,13 @@ class Snake(PlayerControl):
         self.update_direction()
         current = self.positions[0]
         dx, dy = self.direction
-        new_position = ((current[0] + dx * GRID_SIZE) % SCREEN_WIDTH,
-                        (current[1] + dy * GRID_SIZE) % SCREEN_HEIGHT)
-        if new_position in self.positions[2:]:
+        new_position = self.cells[(current[0] // GRID_SIZE + dx) % GRID_WIDTH][
+            (current[1] // GRID_SIZE + dy) % GRID_HEIGHT
+        ]
+        # Сегменты не повторяются, поэтому индекс первого вхождения
+        # заменяет проверку по срезу positions[2:] без копирования списка.
+        if (new_position in self.positions
+                and self.positions.index(new_position) > 1):
             self.reset()
         else:
             self.positions.insert(0, new_position)
@@ -153,15 +186,12 @@ class Snake(PlayerControl):
     def draw(self):
         """Отрисовывает змейку на экране."""
         if self.last:
-            last_rect = pygame.Rect(self.last, (GRID_SIZE, GRID_SIZE))
-            pygame.draw.rect(screen, BOARD_BACKGROUND_COLOR, last_rect)
-        head_rect = pygame.Rect(self.positions[0], (GRID_SIZE, GRID_SIZE))
-        pygame.draw.rect(screen, self.body_color, head_rect)
-        pygame.draw.rect(screen, BORDER_COLOR, head_rect, 1)
-        for pos in self.positions[1:]:
-            rect = pygame.Rect(pos, (GRID_SIZE, GRID_SIZE))
-            pygame.draw.rect(screen, self.body_color, rect)
-            pygame.draw.rect(screen, BORDER_COLOR, rect, 1)
+            cell_rect.topleft = self.last
+            pygame.draw.rect(screen, BOARD_BACKGROUND_COLOR, cell_rect)
+        for pos in self.positions:
+            cell_rect.topleft = pos
+            pygame.draw.rect(screen, self.body_color, cell_rect)
+            pygame.draw.rect(screen, BORDER_COLOR, cell_rect, 1)
 
     def handle_input(self, event):
         """Обрабатывает нажатия клавиш для управления направлением змейки."""
@@ -184,16 +214,25 @@ def main():
     stone = Stone()
     game_objects = [apple, poison, stone]
 
+    pacer = FramePacer(clock, FPS, FRAME_PACING)
+    pause = PauseControl()
+    allow_game_events()
     running = True
     while running:
-        clock.tick(FPS)
+        pacer.tick()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
-            else:
+            elif not pause.handle(event):
                 snake.handle_input(event)
 
+        if pause.paused and running:
+            # На паузе спим в ожидании события, а не крутим цикл.
+            running = pause.wait()
+            pacer.resume()
+            continue
+
         snake.move()
 
         # Проверка столкновений: если голова змейки
@@ -204,12 +243,13 @@ def main():
             if head_pos == obj.position:
                 obj.interact(snake)
 
-        screen.fill(BOARD_BACKGROUND_COLOR)
-        for obj in game_objects:
-            obj.draw()
-        snake.draw()
-
-        pygame.display.flip()
+        # При нехватке времени пропускаем отрисовку, но не тик симуляции.
+        if pacer.should_render():
+            screen.fill(BOARD_BACKGROUND_COLOR)
+            for obj in game_objects:
+                obj.draw()
+            snake.draw()
+            pygame.display.flip()
 
     pygame.quit()
 